@@ -5,7 +5,6 @@
 """
 
 from hvicorn import Bot, CommandContext
-from asyncio import run
 
 # 创建 Bot 实例
 bot = Bot(nick="HvicornTest", channel="lounge")
@@ -23,5 +22,5 @@ async def pong(ctx: CommandContext):
     await ctx.respond("Pong (in async)!")
 
 
-# 使用 asyncio.run() 运行异步 bot
-run(bot.run())
+# bot.start() 在新的事件循环中运行机器人，安装了 uvloop 时使用 uvloop
+bot.start()
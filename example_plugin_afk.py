@@ -13,14 +13,72 @@
         on_afk="你已被标记为离开。",
         afk_tip="{nick} 现在处于离开状态。"
     )
+
+@ 提及查找:
+    AFK 用户较多时，会借助索引查找消息中的 @ 提及，耗时只与消息长度有关，
+    与 AFK 人数无关。安装了 pyahocorasick 时使用 Aho-Corasick 自动机，
+    否则使用纯 Python 的字典树。
 """
 
 import hvicorn
-from typing import Dict, Optional
+import re
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import ahocorasick  # type: ignore
+except ImportError:
+    ahocorasick = None  # type: ignore
+
+# AFK 用户少于此数量时使用正则匹配，使用索引反而更慢
+INDEX_THRESHOLD = 10
+
+# 字典树中存放完整昵称的键（单个字符的键不会与它冲突）
+_TRIE_END = ""
+
+
+def _trie_add(trie: Dict[str, Any], nick: str) -> None:
+    """将昵称加入字典树"""
+    node = trie
+    for char in nick:
+        node = node.setdefault(char, {})
+    node[_TRIE_END] = nick
+
+
+def _trie_remove(trie: Dict[str, Any], nick: str) -> None:
+    """从字典树中移除昵称，并清理空节点"""
+    path = []
+    node = trie
+    for char in nick:
+        if char not in node:
+            return
+        path.append((node, char))
+        node = node[char]
+    node.pop(_TRIE_END, None)
+    for parent, char in reversed(path):
+        if parent[char]:
+            break
+        del parent[char]
 
-# 全局字典，存储 AFK 用户及其原因
-# 键: 用户昵称，值: AFK 原因（可选）
-afked_users: Dict[str, Optional[str]] = {}
+
+def _trie_match(trie: Dict[str, Any], text: str) -> Optional[str]:
+    """返回消息中第一个被 @ 的昵称（同一位置取最长匹配）"""
+    # 用 str.find 直接跳到下一个 @，不逐字符遍历消息
+    i = text.find("@")
+    while i >= 0:
+        node = trie
+        matched = None
+        for char in text[i + 1 : i + 25]:  # 昵称最长 24 个字符
+            child = node.get(char)
+            if child is None:
+                break
+            node = child
+            matched = node.get(_TRIE_END, matched)
+        if matched is not None:
+            return matched
+        i = text.find("@", i + 1)
+    return None
 
 
 async def plugin_init(
@@ -31,6 +89,8 @@ async def plugin_init(
     already_afk: str = "You are already AfKed.",
     reason: str = "Reason: {reason}",
     welcome_back: str = "Welcome back.",
+    max_afk_users: int = 1024,
+    afk_ttl: Optional[float] = None,
 ):
     """插件初始化函数
     
@@ -45,56 +105,175 @@ async def plugin_init(
         already_afk: 用户已经是 AFK 状态时的提示
         reason: 显示 AFK 原因的格式，{reason} 会被替换为实际原因
         welcome_back: 用户返回时的欢迎消息
+        max_afk_users: 最多同时记录的 AFK 用户数，超出时移除最早标记 AFK 的用户，默认为 1024
+        afk_ttl: AFK 状态的有效期（秒），超时后自动取消。默认为 None（不过期）
     """
+    # 以下状态都属于本次加载的插件，多个 Bot 各自加载插件时互不影响
+
+    # 存储 AFK 用户及其原因，按标记 AFK 的先后顺序排列
+    # 键: 用户昵称，值: 有人 @ 该用户时回复的提示（已按 afk_tip / reason 模板渲染好）
+    afked_users: "OrderedDict[str, str]" = OrderedDict()
+    # 用户标记 AFK 的时间（time.monotonic()），与 afked_users 顺序一致
+    afk_since: Dict[str, float] = {}
+    # AFK 用户昵称的字典树（未安装 pyahocorasick 时使用）
+    # 每层以字符为键，_TRIE_END 键存放以该节点结尾的完整昵称
+    trie: Dict[str, Any] = {}
+    # "@(昵称1|昵称2|...)" 正则和 "@昵称" -> 昵称 的 Aho-Corasick 自动机
+    # afked_users 变化时置为 None，下次使用时再重建
+    mention_re: Optional[re.Pattern] = None
+    automaton: Any = None
+
+    def get_mention_re() -> re.Pattern:
+        """获取（必要时重新编译）AFK 用户的 @ 提及正则"""
+        nonlocal mention_re
+        if mention_re is None:
+            # 长昵称排在前面，同一位置优先匹配最长的昵称
+            nicks = sorted(afked_users, key=len, reverse=True)
+            mention_re = re.compile("@(" + "|".join(map(re.escape, nicks)) + ")")
+        return mention_re
+
+    def get_automaton() -> Any:
+        """获取（必要时重建）AFK 用户的 @ 提及自动机"""
+        nonlocal automaton
+        if automaton is None:
+            automaton = ahocorasick.Automaton()  # type: ignore
+            for nick in afked_users:
+                automaton.add_word(f"@{nick}", nick)
+            automaton.make_automaton()
+        return automaton
+
+    def remove_user(nick: str) -> None:
+        """取消用户的 AFK 状态，并同步更新各个索引"""
+        nonlocal automaton, mention_re
+        del afked_users[nick]
+        del afk_since[nick]
+        automaton = None  # 标记自动机和正则需要重建
+        mention_re = None
+        _trie_remove(trie, nick)
+
+    def evict_expired() -> None:
+        """移除超过 afk_ttl 的 AFK 用户（最早标记的用户排在最前面）"""
+        if afk_ttl is None:
+            return
+        deadline = monotonic() - afk_ttl
+        while afked_users:
+            oldest = next(iter(afked_users))
+            if afk_since[oldest] > deadline:
+                break
+            remove_user(oldest)
 
     async def mark_afk(ctx: hvicorn.CommandContext):
         """处理 AFK 命令
         
         将用户标记为 AFK 状态。用户可以提供可选的原因。
         """
-        reason = ctx.args if ctx.args else None  # 获取 AFK 原因（如果有）
-        if ctx.sender.nick in afked_users.keys():
+        nonlocal automaton, mention_re
+        evict_expired()
+        users = afked_users
+        if ctx.sender.nick in users:
             # 用户已经是 AFK 状态
             return await ctx.respond(already_afk)
         # 将用户添加到 AFK 字典中
-        afked_users.update({ctx.sender.nick: reason})
+        # 提示中只有提及者的昵称会变化，其余部分（包括原因）在此时渲染好
+        users.update(
+            {
+                ctx.sender.nick: afk_tip.format(nick=ctx.sender.nick)
+                + (" " + reason.format(reason=ctx.args) if ctx.args else "")  # 如果有原因，也显示
+            }
+        )
+        afk_since[ctx.sender.nick] = monotonic()
+        automaton = None  # 标记自动机和正则需要重建
+        mention_re = None
+        _trie_add(trie, ctx.sender.nick)
+        # 超出上限时移除最早标记 AFK 的用户
+        while len(users) > max_afk_users:
+            remove_user(next(iter(users)))
         return await ctx.respond(on_afk)
 
-    async def back_check(event):
+    async def send_replies(replies: List[str]) -> None:
+        """按顺序发送回复"""
+        for text in replies:
+            await bot.send_message(text)
+
+    def reply(replies: List[str]) -> None:
+        """通过 bot.spawn 在后台发送回复（只有确实需要回复时才创建协程和任务）
+
+        发送失败时由 Bot 记录异常，机器人退出时也会等待或取消这些任务。
+        """
+        bot.spawn(send_replies(replies))
+
+    def check_back(event: Union[hvicorn.ChatPackage, hvicorn.EmotePackage]) -> Optional[str]:
         """检查 AFK 用户是否返回
         
-        全局事件处理器，监控所有事件。
-        当 AFK 用户再次发言时，自动移除其 AFK 状态。
+        当 AFK 用户再次发言时，移除其 AFK 状态。
+        AFK 状态已超过 afk_ttl 的用户视为早已返回，不再发送欢迎消息。
+
+        Returns:
+            Optional[str]: 需要发送的欢迎消息，用户并未返回时为 None
         """
-        if "nick" not in dir(event):
-            # 事件不包含昵称，忽略
-            return
-        if "text" in dir(event) and event.text.startswith(command_prefix):
+        evict_expired()
+        if event.text.startswith(command_prefix):
             # 如果是 AFK 命令本身，不取消 AFK 状态
-            return
-        if event.nick in afked_users.keys():
-            # 用户发言，移除 AFK 状态
-            del afked_users[event.nick]
-            return await bot.send_message(f"@{event.nick} {welcome_back}")
+            return None
+        if event.nick not in afked_users:
+            return None
+        # 用户发言，移除 AFK 状态
+        remove_user(event.nick)
+        return f"@{event.nick} {welcome_back}"
+
+    def find_mention(event: hvicorn.ChatPackage) -> Optional[str]:
+        """检查消息是否 @ 了 AFK 用户
+
+        Returns:
+            Optional[str]: 需要发送的 AFK 提示（只处理第一个匹配的 AFK 用户），没有提及时为 None
+        """
+        evict_expired()
+        users = afked_users
+        text = event.text
+        if not users or "@" not in text:
+            # 没有 AFK 用户，或消息中没有 @（绝大多数消息），直接跳过
+            return None
+        if len(users) < INDEX_THRESHOLD:
+            # AFK 用户较少：用一个正则扫描消息
+            match = get_mention_re().search(text)
+            matched = match.group(1) if match else None
+        elif ahocorasick is not None:
+            # AFK 用户较多：用自动机单次扫描消息
+            # iter 按结束位置产出匹配，这里与正则、字典树保持一致：
+            # 取最早出现的 @，同一位置取最长的昵称
+            matched = min(
+                get_automaton().iter(text),
+                key=lambda item: (item[0] - len(item[1]), -len(item[1])),
+                default=(None, None),
+            )[1]
+        else:
+            # AFK 用户较多且没有 pyahocorasick：用字典树扫描消息
+            matched = _trie_match(trie, text)
+        if matched is None:
+            return None
+        return f"@{event.nick} {users[matched]}"
+
+    def on_emote(event: hvicorn.EmotePackage):
+        """处理动作消息，检查发送者是否从 AFK 状态返回"""
+        welcome = check_back(event)
+        if welcome is not None:
+            reply([welcome])
 
-    async def on_chat(event: hvicorn.ChatPackage):
-        """处理聊天消息，检查是否 @ 了 AFK 用户
+    def on_chat(event: hvicorn.ChatPackage):
+        """处理聊天消息
         
+        先检查发送者是否从 AFK 状态返回，再检查是否 @ 了 AFK 用户，
         当有人 @ 提及 AFK 用户时，自动发送提示。
+        两项检查合并在同一个处理器中，每条聊天消息只需分发一次。
+        处理器本身是同步函数，没有需要回复的内容时（绝大多数消息）不会创建协程。
         """
-        # 遍历所有 AFK 用户
-        for user in afked_users.items():
-            if f"@{user[0]}" in event.text:
-                # 消息中 @ 了这个 AFK 用户
-                await bot.send_message(
-                    f"@{event.nick} {afk_tip.format(nick=user[0])}"
-                    + (" " + reason.format(reason=user[1]) if user[1] else "")  # 如果有原因，也显示
-                )
-                return  # 只处理第一个匹配的 AFK 用户
+        replies = [text for text in (check_back(event), find_mention(event)) if text is not None]
+        if replies:
+            reply(replies)
 
     # 注册命令处理器
     bot.register_command(command_prefix, mark_afk)
-    # 注册全局事件处理器（用于检查用户返回）
-    bot.register_global_function(back_check)
-    # 注册聊天消息处理器（用于检查 @ 提及）
+    # 注册动作消息处理器（用于检查用户返回）
+    bot.register_event_function(hvicorn.EmotePackage, on_emote)
+    # 注册聊天消息处理器（用于检查用户返回和 @ 提及）
     bot.register_event_function(hvicorn.ChatPackage, on_chat)
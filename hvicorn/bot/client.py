@@ -7,20 +7,74 @@ Bot 类负责管理 WebSocket 连接、事件处理、命令路由和用户状
 import asyncio
 import websockets
 import ssl
-from typing import Optional, Literal, Callable, List, Dict, Any, Union
+from types import ModuleType
+from typing import Optional, Literal, Callable, Deque, List, Dict, Any, Set, Tuple, Union
 from pydantic import BaseModel
-from hvicorn.models.client import *
-from hvicorn.models.server import *
-from json import loads, dumps
+from hvicorn.models.client import (
+    ChangeColorRequest,
+    ChangeNickRequest,
+    ChatRequest,
+    EmoteRequest,
+    InviteRequest,
+    JoinRequest,
+    Message,
+    PingRequest,
+    WhisperRequest,
+)
+from hvicorn.models.server import (
+    ChangeNickPackage,
+    ChatPackage,
+    EmotePackage,
+    OnlineAddPackage,
+    OnlineRemovePackage,
+    OnlineSetPackage,
+    UpdateUserPackage,
+    User,
+    WhisperPackage,
+)
 from hvicorn.utils.generate_customid import generate_customid
-from hvicorn.utils.json_to_object import json_to_object, verifyNick
+from hvicorn.utils.json_to_object import parse_package, verifyNick
 from hvicorn.models.client import CustomRequest
+from hvicorn.models.client.serde import to_wire
 from hvicorn.bot.optional_features import OptionalFeatures
-from traceback import format_exc
+from traceback import format_exc, format_exception
+from operator import attrgetter
+from collections import deque
 from logging import debug, warning
 
+try:
+    # uvloop 是可选依赖（pip install hvicorn[speedups]），不支持 Windows
+    import uvloop  # type: ignore
+except ImportError:
+    uvloop = None  # type: ignore
+
+try:
+    # orjson 同样是可选依赖，序列化/解析 JSON 比标准库快得多
+    import orjson  # type: ignore
+
+    loads = orjson.loads
+
+    def dumps(obj: Any) -> str:
+        # orjson 输出 bytes，解码为 str 以便 websockets 仍然发送文本帧
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    from json import loads, dumps  # type: ignore
+
 # hack.chat 的 WebSocket 服务器地址
 WS_ADDRESS = "wss://hack.chat/chat-ws"
+# 发送 join 请求后等待服务器返回 onlineSet 的最长时间（秒）
+JOIN_TIMEOUT = 10
+# 发送队列的消费任务每次唤醒最多连续发送的数据包数
+SEND_BATCH_SIZE = 32
+# 发送队列最多缓存的数据包数，队列满时 send_message 等方法会等待发送任务腾出空间
+OUTBOUND_SIZE = 256
+# 接收缓冲区最多缓存的数据包数，缓冲区满时暂停从 WebSocket 读取
+INBOX_SIZE = 256
+# 带有 nick 字段的事件类型，用于忽略机器人自己发出的消息
+NICK_BEARING_TYPES = frozenset(
+    {ChatPackage, EmotePackage, OnlineAddPackage, OnlineRemovePackage, WhisperPackage}
+)
 
 
 class CommandContext:
@@ -28,8 +82,18 @@ class CommandContext:
     
     表示命令执行时的上下文环境，包含命令发送者、触发方式、参数等信息。
     这个类会被传递给所有的命令处理函数，提供便捷的响应和查询方法。
+    每次触发命令都会创建一个实例，因此使用 __slots__ 减少内存占用。
     """
 
+    __slots__ = ("bot", "sender", "triggered_via", "text", "args", "event")
+
+    bot: "Bot"  # Bot 实例
+    sender: User  # 命令发送者
+    triggered_via: Literal["chat", "whisper"]  # 触发方式
+    text: str  # 完整命令文本
+    args: str  # 命令参数
+    event: Union[WhisperPackage, ChatPackage]  # 原始事件
+
     def __init__(
         self,
         bot: "Bot",
@@ -49,12 +113,12 @@ class CommandContext:
             args (str): 命令参数（不包括命令前缀的部分）
             event (Union[WhisperPackage, ChatPackage]): 触发命令的原始事件对象
         """
-        self.bot: "Bot" = bot  # Bot 实例
-        self.sender: User = sender  # 命令发送者
-        self.triggered_via: Literal["chat", "whisper"] = triggered_via  # 触发方式
-        self.text: str = text  # 完整命令文本
-        self.args: str = args  # 命令参数
-        self.event: Union[WhisperPackage, ChatPackage] = event  # 原始事件
+        self.bot = bot
+        self.sender = sender
+        self.triggered_via = triggered_via
+        self.text = text
+        self.args = args
+        self.event = event
 
     async def respond(self, text, at_sender=True):
         """响应命令
@@ -107,48 +171,165 @@ class Bot:
         self.password = password  # 频道密码（可选）
         self.ws_address = ws_address or WS_ADDRESS  # WebSocket 服务器地址
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None  # WebSocket 连接对象
-        self.startup_functions: List[Callable] = []  # 启动时执行的函数列表
+        # 启动时执行的函数列表，元素为 (是否为异步函数, 函数)
+        self.startup_functions: List[Tuple[bool, Callable]] = []
         # 事件处理函数字典，__GLOBAL__ 是特殊键，用于全局事件处理
-        self.event_functions: Dict[Any, List[Callable]] = {
-            "__GLOBAL__": [self._internal_handler]  # 内部处理器默认注册为全局处理器
+        # 元素为 (是否为异步函数, 函数)，注册时判断一次，分发事件时不必每次调用 iscoroutinefunction
+        self.event_functions: Dict[Any, List[Tuple[bool, Callable]]] = {
+            "__GLOBAL__": [(True, self._internal_handler)]  # 内部处理器默认注册为全局处理器
         }
         self.wsopt: Dict = {}  # WebSocket 连接选项
         self.killed: bool = False  # 机器人是否已被终止的标志
         self.users: List[User] = []  # 当前频道的在线用户列表（自动维护）
+        self._users_by_nick: Dict[str, User] = {}  # 昵称到用户对象的索引（与 users 同步维护）
         self.commands: Dict[str, Callable] = {}  # 命令前缀到处理函数的映射
+        # 包含空格的命令前缀（如 ".hv editmsg"），无法按第一个词直接查找
+        # 按前缀的第一个词分组：{".hv": [".hv editmsg", ".hv invite", ...]}
+        self._multi_word_prefixes: Dict[str, List[str]] = {}
         self.optional_features: OptionalFeatures = OptionalFeatures()  # 可选功能配置
-        self.loaded_plugins: Dict[str, Dict[str, List]] = {}  # 已加载插件的跟踪信息
+        self.loaded_plugins: Dict[str, Dict[str, Any]] = {}  # 已加载插件的跟踪信息
+        # 启用 queued_handlers 时，每个异步处理器对应的事件队列和消费任务
+        self._handler_queues: Dict[Callable, asyncio.Queue] = {}
+        self._handler_workers: Dict[Callable, asyncio.Task] = {}
+        self._joined: asyncio.Event = asyncio.Event()  # 收到 onlineSet（加入频道完成）后设置
+        self._receiver: Optional[asyncio.Task] = None  # run() 中的事件接收循环，join() 会同时等待它
+        self._static_json_cache: Dict[type, str] = {}  # 字段全为默认值的模型（如 PingRequest()）序列化结果缓存
+        self._outbound: asyncio.Queue = asyncio.Queue(OUTBOUND_SIZE)  # 待发送的 JSON 文本
+        self._live_tasks: Set[asyncio.Task] = set()  # 正在运行的后台任务（异步事件处理器等）
+        # 接收缓冲区：读取任务放入原始数据包，连接关闭时放入 None，连接出错时放入异常
+        self._inbox: Deque[Union[str, bytes, None, Exception]] = deque()
+        self._inbox_ready: asyncio.Event = asyncio.Event()  # 缓冲区中有新数据时设置
+        self._inbox_not_full: asyncio.Event = asyncio.Event()  # 缓冲区未满时设置
+        # 启动函数全部完成后设置；run() 之外（未运行启动函数）始终为已设置
+        self._startup_done: asyncio.Event = asyncio.Event()
+        self._startup_done.set()
+        self._startup_running: bool = False  # run() 是否正在运行启动函数
+        # 启动函数完成前收到的事件，完成后由接收循环按顺序分发
+        self._held_events: List[Any] = []
+        # 内部处理器按事件类型分发到的处理方法
+        self._internal_dispatch: Dict[type, Callable] = {
+            OnlineSetPackage: self._on_online_set,
+            OnlineAddPackage: self._on_online_add,
+            OnlineRemovePackage: self._on_online_remove,
+            ChatPackage: self._on_chat,
+            WhisperPackage: self._on_whisper,
+            UpdateUserPackage: self._on_update_user,
+            ChangeNickPackage: self._on_change_nick,
+        }
+        self._writer_task: Optional[asyncio.Task] = None  # 发送队列的消费任务，run() 中启动
+        self._send_error: Optional[Exception] = None  # 发送失败时的异常，之后的发送都会失败
 
-    async def _send_model(self, model: BaseModel) -> None:
+    async def _send_model(self, model: Union[BaseModel, CustomRequest]) -> None:
         """发送 Pydantic 模型到 WebSocket
         
-        将 Pydantic 模型序列化为 JSON 并通过 WebSocket 发送到服务器。
+        将 Pydantic 模型直接序列化为 JSON 并通过 WebSocket 发送到服务器（不经过中间字典）。
         自动过滤 None 值字段，CustomRequest 类型会直接使用原始 JSON。
+        所有字段都是默认值的模型（如 PingRequest()）每种类型只序列化一次。
 
         Args:
-            model (BaseModel): 要发送的 Pydantic 模型对象
+            model (Union[BaseModel, CustomRequest]): 要发送的 Pydantic 模型对象或自定义请求
         """
-        if type(model) == CustomRequest:
+        if not self.websocket:
+            warning(f"Websocket isn't open, ignoring: {model}")
+            return
+        if isinstance(model, CustomRequest):
             # CustomRequest 特殊处理：直接使用原始 JSON（绕过 Pydantic 验证）
-            payload = model.rawjson
+            text = dumps(model.rawjson)
         else:
+            model_type = type(model)
+            cached = self._static_json_cache.get(model_type)
+            if cached is not None and not model.model_fields_set:
+                debug(f"Sent payload: {cached}")
+                await self._send_text(cached)
+                return
             try:
-                # 将 Pydantic 模型转换为字典
-                data = model.model_dump()
+                # 由 Pydantic 的 Rust 核心直接序列化为 JSON，并过滤掉值为 None 的字段，减少传输数据量
+                text = to_wire(model)
             except:
                 warning(f"Cannot stringify model, ignoring: {model}")
                 return
-            # 过滤掉值为 None 的字段，减少传输数据量
-            payload = {}
-            for k, v in data.items():
-                if v != None:
-                    payload.update({k: v})
-        if self.websocket:
-            debug(f"Sent payload: {payload}")
-            # 将字典序列化为 JSON 字符串并发送
-            await self.websocket.send(dumps(payload))
-        else:
-            warning(f"Websocket isn't open, ignoring: {model}")
+            if not model.model_fields_set:
+                self._static_json_cache[model_type] = text
+        debug(f"Sent payload: {text}")
+        await self._send_text(text)
+
+    async def _send_text(self, text: str) -> None:
+        """发送一个 JSON 文本帧
+
+        发送队列的消费任务在运行时放入队列，由其按顺序批量发送；
+        否则（如 run() 之外手动连接时）直接发送。
+        不会创建新任务：队列未满时立即返回，队列已满时等待，
+        因此连续发送大量消息的调用方会被发送速度限制（背压）。
+
+        Args:
+            text (str): 要发送的 JSON 文本
+
+        Raises:
+            ConnectionError: 如果发送队列之前发送失败并已停止
+        """
+        self._raise_send_error()
+        if self._writer_task is not None and not self._writer_task.done():
+            await self._outbound.put(text)
+            # 等待队列空位期间发送失败时，这个数据包不会再被发送
+            self._raise_send_error()
+        elif self.websocket:
+            await self.websocket.send(text)
+
+    def _raise_send_error(self) -> None:
+        """发送队列已因发送失败停止时抛出 ConnectionError"""
+        if self._send_error is not None:
+            raise ConnectionError("Websocket send failed, the send queue has stopped") from self._send_error
+
+    async def _writer_loop(self) -> None:
+        """发送队列的消费任务
+
+        每次唤醒时取出队列中已积压的数据包（最多 SEND_BATCH_SIZE 个）依次发送，
+        连续调用 send_message 等方法时不必每条消息都单独调度一次。
+        hack.chat 要求每个 JSON 单独一帧，因此数据包不会被拼接。
+        发送失败时（通常是连接已断开）记录异常并停止：之后的数据包无法再按顺序送达，
+        之后调用 _send_text 会抛出 ConnectionError，而不是静默丢弃数据包。
+        """
+        queue = self._outbound
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < SEND_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            sent = 0
+            try:
+                for text in batch:
+                    if self.websocket:
+                        await self.websocket.send(text)
+                    sent += 1
+            except Exception as e:
+                self._send_error = e
+                warning(
+                    f"Failed to send payload, stopping the send queue and dropping "
+                    f"{len(batch) - sent + queue.qsize()} unsent package(s): \n{format_exc()}"
+                )
+                return
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _flush_outbound(self) -> None:
+        """等待发送队列中的数据包全部发送完毕（发送队列因发送失败停止时立即返回）"""
+        writer = self._writer_task
+        if writer is None or writer.done():
+            return
+        flushed = asyncio.ensure_future(self._outbound.join())
+        try:
+            await asyncio.wait({flushed, writer}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            flushed.cancel()
+
+    def _stop_writer(self) -> None:
+        """停止发送队列的消费任务，丢弃尚未发送的数据包"""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            self._writer_task = None
+        while not self._outbound.empty():
+            self._outbound.get_nowait()
+            self._outbound.task_done()
 
     def get_users_by(
         self,
@@ -195,20 +376,18 @@ class Bot:
             # 使用自定义函数获取高等级用户
             vips = bot.get_users_by("function", lambda u: u.level >= 100)
         """
-        results = []
-        for user in self.users:
-            if by != "function":
-                # 属性精确匹配
-                if user.__dict__.get(by) == matches:
-                    results.append(user)
-            else:
-                # 使用自定义函数过滤
-                if callable(matches):
-                    if matches(user):
-                        results.append(user)
-                else:
-                    raise ValueError(f"Function {matches} is not callable")
-        return results
+        if by == "nick" and isinstance(matches, str):
+            # 昵称有索引，直接查找
+            user = self._users_by_nick.get(matches)
+            return [user] if user else []
+        if by != "function":
+            # 属性精确匹配
+            getter = attrgetter(by)
+            return [user for user in self.users if getter(user) == matches]
+        # 使用自定义函数过滤
+        if not callable(matches):
+            raise ValueError(f"Function {matches} is not callable")
+        return [user for user in self.users if matches(user)]
 
     def get_user_by(
         self,
@@ -248,7 +427,7 @@ class Bot:
         Returns:
             Optional[User]: The matching user, if found.
         """
-        return self.get_user_by("nick", nick)
+        return self._users_by_nick.get(nick)
 
     async def _internal_handler(self, event: BaseModel) -> None:
         """内部事件处理器
@@ -260,103 +439,142 @@ class Bot:
         3. 用户信息更新（UpdateUser 事件）
         
         此处理器自动注册为全局事件处理器，会接收所有事件。
+        事件按类型在 self._internal_dispatch 中查找对应的处理方法，不需要逐个 isinstance 判断。
 
         Args:
             event (BaseModel): 要处理的事件对象
         """
-        # 处理在线用户列表设置事件（首次加入频道或刷新）
-        if isinstance(event, OnlineSetPackage):
-            self.users = event.users  # 完整替换用户列表
-        # 处理新用户加入事件
-        elif isinstance(event, OnlineAddPackage):
-            self.users.append(
-                User(
-                    channel=event.channel,
-                    color=event.color,
-                    hash=event.hash,
-                    isBot=event.isBot,
-                    isme=False,
-                    level=event.level,
-                    nick=event.nick,
-                    trip=event.trip,
-                    uType=event.uType,
-                    userid=event.userid,
+        handler = self._internal_dispatch.get(type(event))
+        if handler is not None:
+            await handler(event)
+
+    async def _on_online_set(self, event: OnlineSetPackage) -> None:
+        """处理在线用户列表设置事件（首次加入频道或刷新）"""
+        self.users = event.users  # 完整替换用户列表
+        self._users_by_nick = {user.nick: user for user in event.users}
+        self._joined.set()  # 服务器返回了在线用户列表，说明已经加入频道
+
+    async def _on_online_add(self, event: OnlineAddPackage) -> None:
+        """处理新用户加入事件"""
+        new_user = User(
+            channel=event.channel,
+            color=event.color,
+            hash=event.hash,
+            isBot=event.isBot,
+            isme=False,
+            level=event.level,
+            nick=event.nick,
+            trip=event.trip,
+            uType=event.uType,
+            userid=event.userid,
+        )
+        self.users.append(new_user)
+        self._users_by_nick[new_user.nick] = new_user
+
+    async def _on_online_remove(self, event: OnlineRemovePackage) -> None:
+        """处理用户离开事件"""
+        user = self._users_by_nick.pop(event.nick, None)
+        if user:
+            # 按对象身份过滤，不像 list.remove 那样逐个调用 User.__eq__ 比较所有字段
+            self.users = [u for u in self.users if u is not user]
+
+    async def _on_change_nick(self, event: ChangeNickPackage) -> None:
+        """处理改名事件，更新用户对象的昵称和昵称索引
+
+        服务器通常会先发送旧昵称的 onlineRemove 和新昵称的 onlineAdd，此时旧昵称已不在索引中，什么也不做。
+        """
+        user = self._users_by_nick.get(event.old_nick)
+        if user is None or event.new_nick in self._users_by_nick:
+            return
+        del self._users_by_nick[event.old_nick]
+        user.nick = event.new_nick
+        self._users_by_nick[event.new_nick] = user
+
+    async def _on_chat(self, event: ChatPackage) -> None:
+        """处理公开聊天消息中的命令"""
+        await self._dispatch_command(event.text, event, "chat")
+
+    async def _on_whisper(self, event: WhisperPackage) -> None:
+        """处理私聊中的命令"""
+        await self._dispatch_command(event.content, event, "whisper")
+
+    async def _on_update_user(self, event: UpdateUserPackage) -> None:
+        """处理用户信息更新事件"""
+        if not event.nick:
+            return
+        # 找到要更新的用户对象
+        target_user = self.get_user_by_nick(event.nick)
+        if target_user is None:
+            return
+        user_fields = User.model_fields
+        # 只遍历服务器实际发送的字段；nick 用于查找用户，不需要更新
+        for k in event.model_fields_set:
+            if k == "nick" or k not in user_fields:  # 字段不存在于用户对象中
+                continue
+            v = getattr(event, k)
+            if v is not None and getattr(target_user, k) != v:  # 新值不为空且值发生了变化
+                # 更新用户对象的对应属性
+                setattr(target_user, k, v)
+
+    async def _dispatch_command(
+        self,
+        text: str,
+        event: Union[WhisperPackage, ChatPackage],
+        triggered_via: Literal["chat", "whisper"],
+    ) -> None:
+        """查找并执行消息对应的命令
+
+        消息的第一个词直接在 self.commands 中查找，不需要逐个比较所有命令前缀。
+        包含空格的命令前缀（如 ".hv editmsg"）按第一个词分组，只逐个检查同一组的前缀。
+
+        Args:
+            text (str): 消息文本
+            event (Union[WhisperPackage, ChatPackage]): 触发命令的原始事件对象
+            triggered_via (Literal["chat", "whisper"]): 命令触发方式
+        """
+        if not self.commands:
+            return
+        head, _, rest = text.partition(" ")
+        function = self.commands.get(head)
+        if function is not None:
+            await self._run_command(function, text, rest, event, triggered_via)
+        for prefix in self._multi_word_prefixes.get(head, ()):
+            # 检查前缀后紧跟空格或消息结束，不必每次拼接 prefix + " "
+            end = len(prefix)
+            if text.startswith(prefix) and (len(text) == end or text[end] == " "):
+                await self._run_command(
+                    self.commands[prefix],
+                    text,
+                    text[end + 1 :],  # 参数为前缀之后的部分
+                    event,
+                    triggered_via,
                 )
-            )
-        # 处理用户离开事件
-        elif isinstance(event, OnlineRemovePackage):
+
+    async def _run_command(
+        self,
+        function: Callable,
+        text: str,
+        args: str,
+        event: Union[WhisperPackage, ChatPackage],
+        triggered_via: Literal["chat", "whisper"],
+    ) -> None:
+        """创建命令上下文并调用命令处理函数，异常会被记录并忽略
+
+        Args:
+            function (Callable): 命令处理函数
+            text (str): 完整的命令文本
+            args (str): 命令参数
+            event (Union[WhisperPackage, ChatPackage]): 触发命令的原始事件对象
+            triggered_via (Literal["chat", "whisper"]): 命令触发方式
+        """
+        try:
+            # 从用户列表中查找发送者
             user = self.get_user_by_nick(event.nick)
-            if user:
-                self.users.remove(user)  # 从列表中移除该用户
-        # 处理公开聊天消息中的命令
-        if isinstance(event, ChatPackage):
-            for command in self.commands.items():
-                # 检查消息是否以命令前缀开头（前缀+空格）或完全匹配前缀
-                if event.text.startswith(command[0] + " ") or event.text == command[0]:
-                    try:
-                        # 从用户列表中查找发送者
-                        user = self.get_user_by_nick(event.nick)
-                        if not user:
-                            raise RuntimeError("User not found")
-                        # 创建命令上下文并调用处理函数
-                        await command[1](
-                            CommandContext(
-                                self,
-                                user,
-                                "chat",  # 触发方式：公开聊天
-                                event.text,  # 完整消息文本
-                                (
-                                    # 提取命令参数（去除前缀后的部分）
-                                    event.text.split(" ", 1)[1]
-                                    if event.text != command[0]
-                                    else ""  # 如果只有前缀，参数为空字符串
-                                ),
-                                event,  # 原始事件对象
-                            )
-                        )
-                    except:
-                        warning(f"Ignoring exception in command: \n{format_exc()}")
-        if isinstance(event, WhisperPackage):
-            for command in self.commands.items():
-                if (
-                    event.content.startswith(command[0] + " ")
-                    or event.content == command[0]
-                ):
-                    try:
-                        user = self.get_user_by_nick(event.nick)
-                        if not user:
-                            raise RuntimeError("User not found")
-                        await command[1](
-                            CommandContext(
-                                self,
-                                user,
-                                "whisper",
-                                event.content,
-                                (
-                                    event.content.split(" ", 1)[1]
-                                    if event.content != command[0]
-                                    else ""
-                                ),
-                                event,
-                            )
-                        )
-                    except:
-                        warning(f"Ignoring exception in command: \n{format_exc()}")
-        # 处理用户信息更新事件
-        if isinstance(event, UpdateUserPackage):
-            if not event.nick:
-                return
-            # 找到要更新的用户对象
-            target_user = self.get_user_by_nick(event.nick)
-            # 遍历更新包中的所有字段
-            for k, v in event.model_dump().items():
-                if (
-                    k in dir(target_user)  # 字段存在于用户对象中
-                    and v != None  # 新值不为空
-                    and v != target_user.__getattribute__(k)  # 值发生了变化
-                ):
-                    # 更新用户对象的对应属性
-                    target_user.__setattr__(k, v)
+            if not user:
+                raise RuntimeError("User not found")
+            await function(CommandContext(self, user, triggered_via, text, args, event))
+        except:
+            warning(f"Ignoring exception in command: \n{format_exc()}")
 
     async def _connect(self) -> None:
         """连接到 WebSocket 服务器
@@ -364,8 +582,14 @@ class Bot:
         建立与 hack.chat 服务器的 WebSocket 连接。
         如果启用了 bypass_gfw_dns_poisoning 功能，
         会使用 IP 地址直连以绕过 GFW 的 DNS 污染（但可能存在安全风险）。
+        启用 disable_compression 功能时（默认）不协商 permessage-deflate 压缩，
+        wsopt 中显式传入的选项优先。
         """
-        debug(f"Connecting to {self.ws_address}, Websocket options: {self.wsopt}")
+        wsopt = dict(self.wsopt)
+        if self.optional_features.disable_compression:
+            # hack.chat 的数据包都是很小的 JSON，压缩几乎不省流量，却要为每一帧解压
+            wsopt.setdefault("compression", None)
+        debug(f"Connecting to {self.ws_address}, Websocket options: {wsopt}")
         if (
             self.ws_address == "wss://hack.chat/chat-ws"
             and self.optional_features.bypass_gfw_dns_poisoning
@@ -386,55 +610,164 @@ class Bot:
                 "wss://hack.chat/chat-ws",
                 host="104.131.138.176",  # 直接连接到 IP
                 ssl=insecure_ssl_context,
-                **self.wsopt,
+                **wsopt,
             )
         else:
             # 正常连接模式
-            self.websocket = await websockets.connect(self.ws_address, **self.wsopt)
+            self.websocket = await websockets.connect(self.ws_address, **wsopt)
         debug(f"Connected!")
 
-    async def _run_events(
-        self, event_type: Any, args: list, taskgroup: asyncio.TaskGroup
-    ):
+    def spawn(self, coro: Any) -> asyncio.Task:
+        """在后台运行协程
+
+        事件处理器、插件等需要"发出去就不管"的协程都应使用此方法，而不是直接调用
+        asyncio.create_task：任务在结束前会保存在 self._live_tasks 中，以免被回收；
+        任务抛出的异常会被记录并忽略，不会影响机器人和其他任务；
+        run() 退出时会等待（异常退出时先取消）这些任务。
+        必须在事件循环中调用。
+
+        Args:
+            coro (Any): 要运行的协程对象
+
+        Returns:
+            asyncio.Task: 创建的任务
+
+        示例:
+            bot.spawn(bot.send_message("Hello!"))
+        """
+        task = asyncio.get_running_loop().create_task(coro)
+        self._live_tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        """后台任务结束时的回调：移除任务引用并记录异常"""
+        self._live_tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            warning(f"Ignoring exception in background task: \n{''.join(format_exception(exc))}")
+
+    async def _run_events(self, event_type: Any, args: list):
         """运行特定类型的事件处理器
         
         从注册的处理器中找到对应类型的处理函数并执行。
         支持同步和异步处理函数，异步函数会以 Task 形式并发执行。
+        启用 optional_features.queued_handlers 时，异步函数的参数会放入
+        该函数专属的队列，由常驻的消费任务依次处理，不再为每个事件创建 Task。
 
         Args:
             event_type (Any): 事件类型（如 ChatPackage）或 "__GLOBAL__"
             args (list): 要传递给处理函数的参数列表
-            taskgroup (asyncio.TaskGroup): 用于管理并发任务的任务组
         """
-        for function in self.event_functions.get(event_type, []):
+        functions = self.event_functions.get(event_type)
+        if not functions:
+            return
+        for is_coroutine, function in functions:
             try:
-                if asyncio.iscoroutinefunction(function):
-                    # 异步函数：创建任务并发执行
-                    taskgroup.create_task(function(*args))
+                if is_coroutine:
+                    if self.optional_features.queued_handlers:
+                        # 异步函数：交给该函数的消费任务
+                        self._get_handler_queue(function).put_nowait(args)
+                    else:
+                        # 异步函数：创建任务并发执行
+                        self.spawn(function(*args))
                 else:
                     # 同步函数：直接调用
                     function(*args)
             except:
                 warning(f"Ignoring exception in event: \n{format_exc()}")
 
+    def _get_handler_queue(self, function: Callable) -> asyncio.Queue:
+        """获取异步处理器的事件队列，首次使用时创建队列并启动消费任务
+
+        Args:
+            function (Callable): 异步事件处理函数
+
+        Returns:
+            asyncio.Queue: 该处理器的事件队列
+        """
+        queue = self._handler_queues.get(function)
+        if queue is None:
+            queue = asyncio.Queue()
+            self._handler_queues[function] = queue
+            self._handler_workers[function] = self.spawn(self._handler_worker(function, queue))
+            debug(f"Started queue worker for handler {function}")
+        return queue
+
+    async def _handler_worker(self, function: Callable, queue: asyncio.Queue) -> None:
+        """异步处理器的消费任务：依次取出事件参数并调用处理函数
+
+        Args:
+            function (Callable): 异步事件处理函数
+            queue (asyncio.Queue): 该处理器的事件队列
+        """
+        while True:
+            args = await queue.get()
+            try:
+                await function(*args)
+            except Exception:
+                warning(f"Ignoring exception in event: \n{format_exc()}")
+
+    def _stop_handler_workers(self) -> None:
+        """停止所有处理器消费任务，未处理的事件会被丢弃"""
+        for worker in self._handler_workers.values():
+            worker.cancel()
+        self._handler_workers.clear()
+        self._handler_queues.clear()
+
+    def _stop_handler_worker(self, function: Callable) -> None:
+        """停止一个处理器的消费任务并移除它的队列，未处理的事件会被丢弃
+
+        Args:
+            function (Callable): 异步事件处理函数
+        """
+        worker = self._handler_workers.pop(function, None)
+        if worker is not None:
+            worker.cancel()
+            debug(f"Stopped queue worker for handler {function}")
+        self._handler_queues.pop(function, None)
+
     async def join(self) -> None:
         """加入指定的频道
         
         发送 join 请求包到服务器，将机器人加入到目标频道。
         如果频道设有密码，会自动带上密码。
+        发送后会等待服务器返回 onlineSet（最多 JOIN_TIMEOUT 秒），
+        因此调用时事件接收循环必须已经在运行（run() 会保证这一点）。
+        同时等待接收循环：连接在收到 onlineSet 前关闭或出错时立即返回，
+        接收循环的异常会从这里抛出，不必等满 JOIN_TIMEOUT 秒。
         """
         debug(f"Sending join package")
+        self._joined.clear()
         await self._send_model(
-            JoinRequest(nick=self.nick, channel=self.channel, password=self.password)
+            JoinRequest.build(nick=self.nick, channel=self.channel, password=self.password)
         )
-        await asyncio.sleep(1)  # 等待 1 秒让服务器处理
-        debug(f"Done!")
+        joined = asyncio.ensure_future(self._joined.wait())
+        receiver = self._receiver
+        waiters = {joined} if receiver is None else {joined, receiver}
+        try:
+            done, _ = await asyncio.wait(
+                waiters, timeout=JOIN_TIMEOUT, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            joined.cancel()
+        if joined in done:
+            debug(f"Done!")
+            return
+        if receiver is not None and receiver in done:
+            receiver.result()  # 接收循环出错时抛出它的异常
+            warning("Connection closed before onlineSet was received")
+            return
+        warning(f"No onlineSet received within {JOIN_TIMEOUT}s after joining, continuing anyway")
 
     async def send_message(self, text, editable=False) -> Message:
         """发送消息到频道
         
         在当前频道发送一条公开消息。
         如果设置 editable=True，会生成 customId，使消息可编辑。
+        消息放入发送队列后即返回，不会创建新任务；发送队列已满时会等待。
 
         Args:
             text (str): 要发送的消息文本
@@ -452,17 +785,10 @@ class Bot:
         """
         # 如果需要可编辑，生成唯一 ID
         customId = generate_customid() if editable else None
-        await self._send_model(ChatRequest(text=text, customId=customId))
-
-        # 创建消息对象
-        msg = Message(text, customId)
+        await self._send_model(ChatRequest.build(text=text, customId=customId))
 
-        # 为消息对象添加 _edit 方法
-        async def wrapper(*args, **kwargs):
-            await self._send_model(msg._generate_edit_request(*args, **kwargs))
-
-        msg.__setattr__("_edit", wrapper)
-        return msg
+        # 创建消息对象，编辑请求通过本 Bot 发送
+        return Message(text, customId, self)
 
     async def whisper(self, nick: str, text: str) -> None:
         """发送私聊消息
@@ -473,7 +799,7 @@ class Bot:
             nick (str): 接收者的昵称
             text (str): 私聊内容
         """
-        await self._send_model(WhisperRequest(nick=nick, text=text))
+        await self._send_model(WhisperRequest.build(nick=nick, text=text))
 
     async def emote(self, text: str) -> None:
         """发送动作消息
@@ -488,7 +814,7 @@ class Bot:
             await bot.emote("挥手问好")
             # 显示为: *BotName 挥手问好*
         """
-        await self._send_model(EmoteRequest(text=text))
+        await self._send_model(EmoteRequest.build(text=text))
 
     async def change_color(self, color: str = "reset") -> None:
         """更改机器人的颜色
@@ -499,7 +825,7 @@ class Bot:
             color (str, optional): 新颜色。默认为 "reset" （重置为默认颜色）。
                                    支持颜色名（如 "red"、"blue"）或 hex 值（如 "#FF5733"）
         """
-        await self._send_model(ChangeColorRequest(color=color))
+        await self._send_model(ChangeColorRequest.build(color=color))
 
     async def change_nick(self, nick: str) -> None:
         """更改机器人的昵称
@@ -519,7 +845,7 @@ class Bot:
         """
         if not verifyNick(nick):
             raise ValueError("Invalid Nickname")
-        await self._send_model(ChangeNickRequest(nick=nick))
+        await self._send_model(ChangeNickRequest.build(nick=nick))
         self.nick = nick  # 更新内部记录的昵称
 
     async def invite(self, nick: str, channel: Optional[str] = None) -> None:
@@ -530,13 +856,13 @@ class Bot:
             nick (str): The nickname of the user to invite.
             channel (Optional[str], optional): The channel to invite to. Defaults to None.
         """
-        await self._send_model(InviteRequest(nick=nick, to=channel))
+        await self._send_model(InviteRequest.build(nick=nick, to=channel))
 
     async def ping(self) -> None:
         """
         Send a ping request to the server.
         """
-        await self._send_model(PingRequest())
+        await self._send_model(PingRequest.build())
 
     def on(
         self, event_type: Optional[Any] = None
@@ -570,14 +896,7 @@ class Bot:
             nonlocal event_type
             if event_type is None:
                 event_type = "__GLOBAL__"  # 未指定类型，注册为全局处理器
-            if event_type in self.event_functions.keys():
-                # 追加到现有处理器列表
-                self.event_functions[event_type].append(func)
-                debug(f"Added handler for {event_type}: {func}")
-            else:
-                # 创建新的处理器列表
-                self.event_functions[event_type] = [func]
-                debug(f"Set handler for {event_type} to {func}")
+            self.register_event_function(event_type, func)
             return func
 
         return wrapper
@@ -587,6 +906,8 @@ class Bot:
         
         注册一个在机器人启动时执行的函数。
         这些函数会在加入频道后、开始接收事件前执行。
+        启动函数运行期间收到的事件会先暂存，全部启动函数完成后再按顺序分发给事件处理器，
+        因此事件处理器不会在启动函数完成前被调用；此时 bot.users 已是 onlineSet 中的在线用户列表。
 
         Args:
             function (Callable): 要在启动时运行的函数（支持同步和异步）
@@ -597,7 +918,7 @@ class Bot:
                 print("机器人已启动！")
                 await bot.send_message("大家好！")
         """
-        self.startup_functions.append(function)
+        self.startup_functions.append((asyncio.iscoroutinefunction(function), function))
         debug(f"Added startup function: {function}")
         return None
 
@@ -628,12 +949,7 @@ class Bot:
         """
 
         def wrapper(func: Callable[[CommandContext], Any]):
-            if prefix in self.commands.keys():
-                # 警告：覆盖现有命令
-                warning(
-                    f"Overriding function {self.commands[prefix]} for command prefix {prefix}"
-                )
-            self.commands[prefix] = func
+            self.register_command(prefix, func)
             return func
 
         return wrapper
@@ -646,11 +962,12 @@ class Bot:
             event_type (Any): The type of event to handle.
             function (Callable): The function to handle the event.
         """
+        entry = (asyncio.iscoroutinefunction(function), function)
         if event_type in self.event_functions.keys():
-            self.event_functions[event_type].append(function)
+            self.event_functions[event_type].append(entry)
             debug(f"Added handler for {event_type}: {function}")
         else:
-            self.event_functions[event_type] = [function]
+            self.event_functions[event_type] = [entry]
             debug(f"Set handler for {event_type} to {function}")
 
     def register_global_function(self, function: Callable):
@@ -669,7 +986,7 @@ class Bot:
         Args:
             function (Callable): The function to run at startup.
         """
-        self.startup_functions.append(function)
+        self.startup_functions.append((asyncio.iscoroutinefunction(function), function))
         debug(f"Added startup function: {function}")
 
     def register_command(self, prefix: str, function: Callable):
@@ -681,9 +998,12 @@ class Bot:
             function (Callable): The function to handle the command.
         """
         if prefix in self.commands.keys():
+            # 警告：覆盖现有命令
             warning(
                 f"Overriding function {self.commands[prefix]} for command prefix {prefix}"
             )
+        elif " " in prefix:
+            self._multi_word_prefixes.setdefault(prefix.partition(" ")[0], []).append(prefix)
         self.commands[prefix] = function
 
     def kill(self) -> None:
@@ -697,7 +1017,7 @@ class Bot:
         debug("Killing ws")
         if not self.websocket:
             raise ConnectionError("Websocket is already closed / not open")
-        asyncio.create_task(self.websocket.close())
+        asyncio.create_task(self.close_ws())
 
     async def close_ws(self) -> None:
         """
@@ -709,8 +1029,47 @@ class Bot:
         debug("Closing ws")
         if not self.websocket:
             raise ConnectionError("Websocket is already closed / not open")
+        # 先发送完已经排队的数据包
+        await self._flush_outbound()
         await self.websocket.close()
 
+    def import_plugin(self, plugin_name: str) -> Optional[ModuleType]:
+        """
+        Import a plugin module without initializing it.
+
+        Importing is synchronous, so it can be done at module load time, before the event loop starts;
+        pass the returned module to activate_plugin() later.
+
+        Args:
+            plugin_name (str): The name of the plugin to import.
+
+        Returns:
+            Optional[ModuleType]: The plugin module, or None if it can't be imported or has no callable plugin_init.
+        """
+        try:
+            plugin = __import__(plugin_name)
+        except ImportError:
+            debug(f"Failed to load plugin {plugin_name}, ignoring")
+            return None
+        if "plugin_init" not in dir(plugin):
+            debug(f"Failed to find init function of plugin {plugin_name}, ignoring")
+            return None
+        if not callable(plugin.plugin_init):
+            debug(f"Init function of plugin {plugin_name} isn't callable, ignoring")
+            return None
+        return plugin
+
+    async def activate_plugin(self, plugin: ModuleType, *args, **kwargs) -> None:
+        """
+        Initialize an already imported plugin module (see import_plugin()).
+
+        Args:
+            plugin (ModuleType): The plugin module, it must define plugin_init.
+            *args: Additional positional arguments to pass to plugin_init.
+            **kwargs: Additional keyword arguments to pass to plugin_init.
+        """
+        await self.load_plugin(plugin.__name__, plugin.plugin_init, *args, **kwargs)
+
     async def load_plugin(
         self,
         plugin_name: str,
@@ -721,45 +1080,34 @@ class Bot:
         """
         Load a plugin.
 
+        Equivalent to import_plugin() followed by activate_plugin(), unless init_function is given.
+
         Args:
             plugin_name (str): The name of the plugin to load.
             init_function (Optional[Callable], optional): Custom initialization function. Defaults to None.
             *args: Additional positional arguments to pass to the init function.
             **kwargs: Additional keyword arguments to pass to the init function.
         """
+        if init_function is None:
+            plugin = self.import_plugin(plugin_name)
+            if plugin is None:
+                return
+            function: Callable = plugin.plugin_init
+        else:
+            function = init_function
+
         # 记录插件加载前的状态
         commands_before = set(self.commands.keys())
         event_handlers_before = {k: len(v) for k, v in self.event_functions.items()}
-        
-        if not init_function:
-            try:
-                plugin = __import__(plugin_name)
-            except ImportError:
-                debug(f"Failed to load plugin {plugin_name}, ignoring")
-                return
-            if "plugin_init" not in dir(plugin):
-                debug(f"Failed to find init function of plugin {plugin_name}, ignoring")
-                return
-            if not callable(plugin.plugin_init):
-                debug(f"Init function of plugin {plugin_name} isn't callable, ignoring")
-                return
-            try:
-                if asyncio.iscoroutinefunction(plugin.plugin_init):
-                    await plugin.plugin_init(self, *args, **kwargs)
-                else:
-                    plugin.plugin_init(self, *args, **kwargs)
-            except:
-                debug(f"Failed to init plugin {plugin_name}: \n{format_exc()}")
-                return
-        else:
-            try:
-                if asyncio.iscoroutinefunction(init_function):
-                    await init_function(self, *args, **kwargs)
-                else:
-                    init_function(self, *args, **kwargs)
-            except:
-                debug(f"Failed to init plugin {plugin_name}: \n{format_exc()}")
-                return
+
+        try:
+            if asyncio.iscoroutinefunction(function):
+                await function(self, *args, **kwargs)
+            else:
+                function(self, *args, **kwargs)
+        except:
+            debug(f"Failed to init plugin {plugin_name}: \n{format_exc()}")
+            return
         
         debug(f"Loaded plugin {plugin_name}")
         
@@ -795,15 +1143,32 @@ class Bot:
         for command in plugin_info["commands"]:
             if command in self.commands:
                 del self.commands[command]
+                if " " in command:
+                    head = command.partition(" ")[0]
+                    group = self._multi_word_prefixes[head]
+                    group.remove(command)
+                    if not group:
+                        del self._multi_word_prefixes[head]
                 debug(f"Unregistered command: {command}")
         
         # 移除插件注册的事件处理器
+        removed = []
         for event_type, handlers in plugin_info["handlers"].items():
             if event_type in self.event_functions:
                 for handler in handlers:
                     if handler in self.event_functions[event_type]:
                         self.event_functions[event_type].remove(handler)
+                        removed.append(handler)
                         debug(f"Unregistered handler for {event_type}")
+
+        # 停止这些处理器的消费任务（启用 queued_handlers 时），不再处理已排队的事件
+        # 同一函数仍注册在其他事件类型下时保留它的队列
+        still_registered = {
+            function for handlers in self.event_functions.values() for _, function in handlers
+        }
+        for _, function in removed:
+            if function not in still_registered:
+                self._stop_handler_worker(function)
         
         # 从已加载插件列表中移除
         del self.loaded_plugins[plugin_name]
@@ -822,57 +1187,188 @@ class Bot:
         """
         self.wsopt = wsopt if wsopt != {} else self.wsopt
         await self._connect()
-        await self.join()
-        for function in self.startup_functions:
-            debug(f"Running startup function: {function}")
-            if asyncio.iscoroutinefunction(function):
-                await function()
-            else:
-                function()
+        self._send_error = None
+        self._writer_task = self.spawn(self._writer_loop())
+        # 先开始接收事件，join() 需要等待服务器返回的 onlineSet
+        # 接收循环不放入 self._live_tasks，它的异常需要从 run() 抛出
+        # 启动函数完成前，接收循环只处理 onlineSet，其余事件暂存
+        self._startup_done.clear()
+        self._held_events.clear()
+        receiver = asyncio.get_running_loop().create_task(self._receive_loop(ignore_self))
+        self._receiver = receiver
+        finished = False
         try:
-            async with asyncio.TaskGroup() as taskgroup:
-                while not self.killed and self.websocket is not None:
-                    try:
-                        package = await self.websocket.recv()
-                    except websockets.ConnectionClosed:
-                        debug("Connection closed")
-                        self.killed = True
-                        await self._run_events("disconnect", [], taskgroup=taskgroup)
-                        break
-                    except Exception as e:
-                        raise RuntimeError("Websocket connection error: ", e)
-                    if not package:
-                        debug("Killed")
-                        self.killed = True
-                        break
-                    package_dict: Dict[Any, Any] = loads(package)
-                    try:
-                        event = json_to_object(package_dict)
-                    except Exception as e:
-                        debug(e)
-                        warning(
-                            f"Failed to parse event, ignoring: {package_dict} cause exception: \n{format_exc()}"
-                        )
-                        continue
-                    debug(f"Got event {type(event)}::{str(event)}")
-                    if isinstance(
-                        event,
-                        (
-                            ChatPackage,
-                            EmotePackage,
-                            OnlineAddPackage,
-                            OnlineRemovePackage,
-                            WhisperPackage,
-                        ),
-                    ):
-                        if event.nick == self.nick and ignore_self:
-                            debug("Found self.nick, ignoring")
-                            continue
+            await self.join()
+            if not receiver.done():
+                # 连接在加入频道前就已关闭时，不再运行启动函数
+                self._startup_running = True
+                for is_coroutine, function in self.startup_functions:
+                    debug(f"Running startup function: {function}")
+                    if is_coroutine:
+                        await function()
                     else:
-                        debug("No nick provided in event, passing loopcheck")
-                    await self._run_events("__GLOBAL__", [event], taskgroup)
-                    await self._run_events(type(event), [event], taskgroup)
-                if self.websocket and self.websocket.open:
-                    self.kill()
+                        function()
+            self._release_held_events()
+            await receiver
+            finished = True
         except asyncio.exceptions.CancelledError:
             pass
+        finally:
+            receiver.cancel()
+            self._receiver = None
+            self._startup_running = False
+            self._startup_done.set()
+            self._stop_handler_workers()
+            # 发送队列最后停止：事件处理器收尾时发送的数据包仍按顺序经由队列发送
+            while True:
+                tasks = [task for task in self._live_tasks if task is not self._writer_task]
+                if not tasks:
+                    break
+                if not finished:
+                    # 出错或被取消时，同时取消仍在运行的事件处理器
+                    for task in tasks:
+                        task.cancel()
+                # 等待仍在运行的事件处理器结束（它们可能又创建了新的后台任务）
+                await asyncio.gather(*tasks, return_exceptions=True)
+            if finished:
+                await self._flush_outbound()
+            self._stop_writer()
+
+    async def _read_loop(self) -> None:
+        """读取任务：不断从 WebSocket 接收数据包放入接收缓冲区
+
+        与事件处理分开运行，处理事件时也能继续接收数据；
+        缓冲区满（INBOX_SIZE）时暂停读取，等待事件处理跟上。
+        """
+        inbox = self._inbox
+        try:
+            while self.websocket is not None:
+                inbox.append(await self.websocket.recv())
+                self._inbox_ready.set()
+                if len(inbox) >= INBOX_SIZE:
+                    self._inbox_not_full.clear()
+                    await self._inbox_not_full.wait()
+        except websockets.ConnectionClosed:
+            inbox.append(None)
+        except Exception as e:
+            inbox.append(RuntimeError("Websocket connection error: ", e))
+        self._inbox_ready.set()
+
+    async def _receive_loop(self, ignore_self: bool) -> None:
+        """事件接收循环
+
+        启动读取任务，并不断从接收缓冲区取出数据包，解析为事件对象并分发给事件处理器，
+        直到连接关闭或机器人被终止。缓冲区中已有的数据包会一次处理完，
+        不必每个数据包都等待一次 recv()。
+
+        Args:
+            ignore_self (bool): 是否忽略机器人自己发出的消息
+
+        Raises:
+            RuntimeError: If there's a websocket connection error.
+        """
+        inbox = self._inbox
+        inbox.clear()
+        self._inbox_not_full.set()
+        reader = asyncio.get_running_loop().create_task(self._read_loop())
+        try:
+            while True:
+                if self._held_events and self._startup_done.is_set():
+                    await self._dispatch_held_events()
+                if not inbox:
+                    # 等待期间被 kill() 时，仍会收到连接关闭并触发 disconnect 事件
+                    self._inbox_ready.clear()
+                    await self._inbox_ready.wait()
+                    continue
+                package = inbox.popleft()
+                self._inbox_not_full.set()
+                if package is None:
+                    debug("Connection closed")
+                    self.killed = True
+                    if self._startup_running:
+                        # 启动函数运行期间断开：等它们完成，再分发暂存的事件
+                        await self._startup_done.wait()
+                    await self._dispatch_held_events()
+                    await self._run_events("disconnect", [])
+                    break
+                if isinstance(package, Exception):
+                    raise package
+                if not package:
+                    debug("Killed")
+                    self.killed = True
+                    break
+                await self._handle_package(package, ignore_self)
+                if self.killed:
+                    break
+        finally:
+            reader.cancel()
+        if self.websocket and self.websocket.open:
+            self.kill()
+
+    async def _handle_package(self, package: Union[str, bytes], ignore_self: bool) -> None:
+        """解析一个数据包并分发给事件处理器
+
+        Args:
+            package (Union[str, bytes]): 从 WebSocket 收到的原始数据包
+            ignore_self (bool): 是否忽略机器人自己发出的消息
+        """
+        try:
+            # 常见的数据包直接从 JSON 文本解析为模型，其余的用 loads() 解析后交给 json_to_object()
+            event = parse_package(package, loads)
+        except Exception as e:
+            debug(e)
+            warning(
+                f"Failed to parse event, ignoring: {package!r} cause exception: \n{format_exc()}"
+            )
+            return
+        debug(f"Got event {type(event)}::{str(event)}")
+        if type(event) in NICK_BEARING_TYPES:
+            if event.nick == self.nick and ignore_self:  # type: ignore
+                debug("Found self.nick, ignoring")
+                return
+        else:
+            debug("No nick provided in event, passing loopcheck")
+        if not self._startup_done.is_set():
+            if type(event) is OnlineSetPackage:
+                # 先更新在线用户列表，join() 等待的就是它；启动函数完成后仍会照常分发
+                await self._on_online_set(event)
+            self._held_events.append(event)
+            return
+        await self._dispatch_event(event)
+
+    async def _dispatch_event(self, event: Any) -> None:
+        """把事件分发给全局处理器和该类型的处理器"""
+        await self._run_events("__GLOBAL__", [event])
+        await self._run_events(type(event), [event])
+
+    def _release_held_events(self) -> None:
+        """启动函数完成：唤醒接收循环，由它按顺序分发暂存的事件"""
+        self._startup_running = False
+        self._startup_done.set()
+        self._inbox_ready.set()
+
+    async def _dispatch_held_events(self) -> None:
+        """按收到的顺序分发启动函数完成前暂存的事件"""
+        held = self._held_events
+        self._held_events = []
+        for event in held:
+            await self._dispatch_event(event)
+
+    def start(self, ignore_self: bool = True, wsopt: Dict = {}) -> None:
+        """
+        Run the bot in a new event loop and block until it stops.
+
+        If uvloop is installed and optional_features.use_uvloop is enabled (the default),
+        the bot runs on uvloop's event loop, which speeds up websocket I/O and task scheduling.
+        Otherwise the default asyncio event loop is used.
+
+        Args:
+            ignore_self (bool, optional): Whether to ignore messages from the bot itself. Defaults to True.
+            wsopt (Dict, optional): Additional websocket options. Defaults to {}.
+        """
+        if uvloop is not None and self.optional_features.use_uvloop:
+            debug("Running on uvloop")
+            with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                runner.run(self.run(ignore_self, wsopt))
+        else:
+            asyncio.run(self.run(ignore_self, wsopt))
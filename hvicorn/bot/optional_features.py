@@ -12,3 +12,29 @@ class OptionalFeatures(BaseModel):
 
     Defaults to False.
     """
+
+    disable_compression: bool = True
+    """
+    Flag to connect without the permessage-deflate extension. hack.chat packets are small
+    JSON, so compressing them saves little bandwidth but costs CPU on every frame.
+
+    A "compression" key passed in wsopt takes precedence. Defaults to True.
+    """
+
+    use_uvloop: bool = True
+    """
+    Flag to run the bot on uvloop's event loop in Bot.start(), if uvloop is installed.
+
+    Defaults to True.
+    """
+
+    queued_handlers: bool = False
+    """
+    Flag to feed each async event handler from its own queue, drained by one long-running
+    worker task, instead of creating a new task for every event.
+
+    Each handler then processes its events one at a time, so only enable this if your
+    handlers (and commands, which run inside the internal handler) don't block for long.
+
+    Defaults to False.
+    """
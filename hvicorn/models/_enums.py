@@ -0,0 +1,18 @@
+"""Enums 模块 - 共享的字面量类型
+
+多个模型共用的 Literal 类型集中定义在这里，各模型引用同一个对象，
+避免在每个模型中重复声明。
+"""
+
+from typing import Literal
+
+# 用户类型
+UType = Literal["user", "mod", "admin"]
+
+# 消息编辑模式
+EditMode = Literal["overwrite", "prepend", "append", "complete"]
+
+# 速率限制类型
+RLType = Literal[
+    "CHANNEL_RL", "COLOR_RL", "INVITE_RL", "CHANGENICK_RL", "MESSAGE_RL", "GLOBAL_RL"
+]
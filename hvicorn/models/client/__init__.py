@@ -1,3 +1,4 @@
+from hvicorn.models.client.base import ClientRequest
 from hvicorn.models.client.chat import ChatRequest, Message
 from hvicorn.models.client.join import JoinRequest
 from hvicorn.models.client.update_message import UpdateMessageRequest
@@ -0,0 +1,36 @@
+"""Base 模块 - 客户端请求基类
+
+包含 ClientRequest 基类，所有由机器人发送到服务器的请求模型都继承自它。
+"""
+
+from typing import Any, Self
+from pydantic import BaseModel, ConfigDict
+
+
+class ClientRequest(BaseModel):
+    """客户端请求基类
+    
+    在 BaseModel 的基础上提供 build() 方法，用于由框架内部代码创建请求对象。
+    
+    注意:
+        build() 会跳过 Pydantic 验证，只应在字段类型已经确定的地方使用
+        （如 Bot 的 send_message() 等方法）。来自用户或外部的数据仍应使用
+        普通构造函数，以便进行验证。
+
+    配置:
+        defer_build: 模型的验证器和序列化器推迟到第一次使用时再构建，减少导入时间
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+    @classmethod
+    def build(cls, **kwargs: Any) -> Self:
+        """创建请求对象（不进行验证）
+
+        Args:
+            **kwargs: 字段值，未提供的字段使用默认值
+
+        Returns:
+            Self: 请求对象
+        """
+        return cls.model_construct(**kwargs)
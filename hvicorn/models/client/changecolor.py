@@ -4,10 +4,10 @@
 """
 
 from typing import Literal
-from pydantic import BaseModel
+from hvicorn.models.client.base import ClientRequest
 
 
-class ChangeColorRequest(BaseModel):
+class ChangeColorRequest(ClientRequest):
     """更改颜色请求模型
     
     表示更改机器人昵称显示颜色的请求。
@@ -4,10 +4,10 @@
 """
 
 from typing import Literal
-from pydantic import BaseModel
+from hvicorn.models.client.base import ClientRequest
 
 
-class ChangeNickRequest(BaseModel):
+class ChangeNickRequest(ClientRequest):
     """更改昵称请求模型
     
     表示更改机器人昵称的请求。
@@ -3,10 +3,12 @@
 包含 Message 类（可编辑消息）和 ChatRequest（发送消息请求）。
 """
 
-from pydantic import BaseModel
-from typing import Optional, Literal
+from hvicorn.models.client.base import ClientRequest
+from typing import Any, Deque, Optional, Literal
 from hvicorn.models.client.update_message import UpdateMessageRequest
-from asyncio import run
+from hvicorn.models._enums import EditMode
+from asyncio import get_running_loop
+from collections import deque
 from warnings import warn
 
 
@@ -26,22 +28,57 @@ class Message:
         - prepend: 在消息开头插入文本
         - append: 在消息末尾追加文本
         - complete: 标记消息为完成，之后不可再编辑
+
+    可编辑的消息会一直保留到 complete，因此使用 __slots__ 减少内存占用。
+    追加和插入的文本片段先存放在双端队列中，读取 text 时才拼接成字符串，
+    逐段流式编辑同一条消息时不必每次都复制整条消息。
     """
 
-    def __init__(self, text: str, customId: Optional[str] = None) -> None:
+    __slots__ = ("_parts", "_text", "customId", "editable", "_bot")
+
+    _parts: Deque[str]  # 消息内容的文本片段
+    _text: Optional[str]  # 拼接好的消息内容，片段变化后为 None
+
+    def __init__(
+        self, text: str, customId: Optional[str] = None, bot: Optional[Any] = None
+    ) -> None:
         """初始化 Message 实例
 
         Args:
             text (str): 消息内容
             customId (Optional[str], optional): 唯一标识符。默认为 None。
+            bot (Optional[Bot], optional): 发送此消息的 Bot 实例，编辑请求通过它发送。默认为 None。
         """
         self.text = text
         self.customId = customId
         self.editable = customId is not None  # 有 customId 才可编辑
-
-    def _generate_edit_request(
-        self, mode: Literal["overwrite", "prepend", "append", "complete"], text: str
-    ):
+        self._bot = bot
+
+    @property
+    def text(self) -> str:
+        """消息内容"""
+        if self._text is None:
+            self._text = "".join(self._parts)
+            # 拼接后只保留一个片段，下次修改时不必重新拼接之前的内容
+            self._parts = deque((self._text,))
+        return self._text
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self._parts = deque((value,))
+        self._text = value
+
+    def _append_text(self, text: str) -> None:
+        """在消息末尾追加文本片段"""
+        self._parts.append(text)
+        self._text = None
+
+    def _prepend_text(self, text: str) -> None:
+        """在消息开头插入文本片段"""
+        self._parts.appendleft(text)
+        self._text = None
+
+    def _generate_edit_request(self, mode: EditMode, text: str):
         """生成消息编辑请求
         
         内部方法，用于创建 UpdateMessageRequest 对象。
@@ -59,18 +96,17 @@ class Message:
         if not self.editable:
             raise ValueError("This message isn't editable.")
         if self.customId:
-            return UpdateMessageRequest(customId=self.customId, mode=mode, text=text)
+            return UpdateMessageRequest.build(customId=self.customId, mode=mode, text=text)
         else:
             raise ValueError("Missing customId")
 
-    async def _edit(
-        self, mode: Literal["overwrite", "prepend", "append", "complete"], text: str
-    ) -> None: 
+    async def _edit(self, mode: EditMode, text: str) -> None:
         """内部编辑方法
         
-        此方法会在 Bot 类中被重写，用于实际发送编辑请求。
+        通过发送此消息的 Bot 实例发送编辑请求；没有关联 Bot 时什么也不做。
         """
-        ...
+        if self._bot is not None:
+            await self._bot._send_model(self._generate_edit_request(mode, text))
 
     async def edit(self, text):
         """异步编辑消息（覆盖模式）
@@ -103,7 +139,7 @@ class Message:
             msg = await bot.send_message("World", editable=True)
             await msg.prepend("Hello ")  # 结果: "Hello World"
         """
-        self.text = text + self.text
+        self._prepend_text(text)
         return await self._edit("prepend", text)
 
     async def append(self, text):
@@ -119,7 +155,7 @@ class Message:
             msg = await bot.send_message("Hello", editable=True)
             await msg.append(" World")  # 结果: "Hello World"
         """
-        self.text += text
+        self._append_text(text)
         return await self._edit("append", text)
 
     async def complete(self):
@@ -136,38 +172,69 @@ class Message:
         self.editable = False
         if not self.customId:
             raise SyntaxError("Missing customId")
-        return UpdateMessageRequest(customId=self.customId, mode="complete")
+        return UpdateMessageRequest.build(customId=self.customId, mode="complete")
 
     def __add__(self, string: str):
         """
         Implement the addition operator to append text to the message.
 
+        The edit request is scheduled on the running event loop and sent in the background;
+        use ``await msg.append(...)`` to wait for it.
+
         Args:
             string (str): The text to append.
 
         Returns:
             Message: The updated Message instance.
+
+        Raises:
+            RuntimeError: If there's no running event loop.
         """
-        warn(DeprecationWarning("The __add__ method starts a new event loop and is not considered best practice. Will be removed in a future release."))
-        run(self.append(string))
+        warn(DeprecationWarning("The __add__ method sends the edit in the background. Use `await msg.append(...)` instead. Will be removed in a future release."))
+        self._append_text(string)
+        self._schedule_edit("append", string)
         return self
 
     def __radd__(self, string: str):
         """
         Implement the right addition operator to prepend text to the message.
 
+        The edit request is scheduled on the running event loop and sent in the background;
+        use ``await msg.prepend(...)`` to wait for it.
+
         Args:
             string (str): The text to prepend.
 
         Returns:
             Message: The updated Message instance.
+
+        Raises:
+            RuntimeError: If there's no running event loop.
         """
-        warn(DeprecationWarning("The __radd__ method starts a new event loop and is not considered best practice. Will be removed in a future release."))
-        run(self.prepend(string))
+        warn(DeprecationWarning("The __radd__ method sends the edit in the background. Use `await msg.prepend(...)` instead. Will be removed in a future release."))
+        self._prepend_text(string)
+        self._schedule_edit("prepend", string)
         return self
 
+    def _schedule_edit(self, mode: Literal["prepend", "append"], text: str) -> None:
+        """通过 Bot.spawn 在后台发送编辑请求（供 + 运算符使用）
+
+        没有关联 Bot 时没有需要发送的请求，只更新本地内容。
+
+        Raises:
+            RuntimeError: 如果当前没有正在运行的事件循环
+        """
+        try:
+            get_running_loop()
+        except RuntimeError:
+            raise RuntimeError(
+                "Editing a message with + needs a running event loop, use `await msg.append(...)` / `await msg.prepend(...)` instead"
+            ) from None
+        if self._bot is not None:
+            self._bot.spawn(self._edit(mode, text))
+
 
-class ChatRequest(BaseModel):
+class ChatRequest(ClientRequest):
     """聊天消息请求模型
     
     表示发送到 hack.chat 频道的公开消息请求。
@@ -3,14 +3,16 @@
 包含 CustomRequest 模型，用于发送原始 JSON 数据。
 """
 
-from pydantic import BaseModel
+from dataclasses import dataclass
 
 
-class CustomRequest(BaseModel):
+@dataclass(slots=True, frozen=True)
+class CustomRequest:
     """自定义请求模型
     
     用于发送原始 JSON 数据，绕过 Pydantic 验证。
     这是一个特殊模型，允许发送任意 JSON 结构到服务器。
+    它只包装一个字典，因此是普通的数据类而不是 Pydantic 模型。
     
     属性:
         rawjson: 原始 JSON 字典
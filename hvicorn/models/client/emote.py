@@ -4,10 +4,10 @@
 """
 
 from typing import Literal
-from pydantic import BaseModel
+from hvicorn.models.client.base import ClientRequest
 
 
-class EmoteRequest(BaseModel):
+class EmoteRequest(ClientRequest):
     """动作消息请求模型
     
     表示发送动作消息的请求（类似 IRC 的 /me 命令）。
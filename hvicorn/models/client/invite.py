@@ -4,11 +4,11 @@
 """
 
 from typing import Literal
-from pydantic import BaseModel
+from hvicorn.models.client.base import ClientRequest
 from typing import Optional
 
 
-class InviteRequest(BaseModel):
+class InviteRequest(ClientRequest):
     """邀请请求模型
     
     表示邀请指定用户加入某个频道的请求。
@@ -4,10 +4,10 @@
 """
 
 from typing import Literal, Optional
-from pydantic import BaseModel
+from hvicorn.models.client.base import ClientRequest
 
 
-class JoinRequest(BaseModel):
+class JoinRequest(ClientRequest):
     """加入频道请求模型
     
     表示机器人请求加入一个 hack.chat 频道。
@@ -4,10 +4,10 @@
 """
 
 from typing import Literal
-from pydantic import BaseModel
+from hvicorn.models.client.base import ClientRequest
 
 
-class PingRequest(BaseModel):
+class PingRequest(ClientRequest):
     """Ping 请求模型
     
     表示向服务器发送 Ping 请求以保持连接活跃。
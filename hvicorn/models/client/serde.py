@@ -0,0 +1,24 @@
+"""Serde 模块 - 请求序列化工具
+
+包含 to_wire() 函数，用于将请求模型序列化为发送到服务器的 JSON 文本。
+"""
+
+from pydantic import BaseModel
+
+
+def to_wire(model: BaseModel) -> str:
+    """将请求模型序列化为 JSON 文本，值为 None 的字段会被省略
+
+    直接调用模型类上缓存的 Rust 序列化器（每个模型类只构建一次），
+    比 model_dump_json() 少一层参数处理；另外创建 TypeAdapter 只会包装同一个序列化器。
+
+    Args:
+        model (BaseModel): 要序列化的请求模型
+
+    Returns:
+        str: JSON 文本（websockets 会以文本帧发送）
+    """
+    if not model.__pydantic_complete__:
+        # 启用 defer_build 的模型在第一次序列化前构建序列化器
+        type(model).model_rebuild()
+    return model.__pydantic_serializer__.to_json(model, exclude_none=True).decode()
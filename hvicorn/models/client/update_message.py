@@ -3,11 +3,12 @@
 包含 UpdateMessageRequest 模型，用于表示编辑已发送消息的请求。
 """
 
-from pydantic import BaseModel
+from hvicorn.models.client.base import ClientRequest
 from typing import Optional, Literal
+from hvicorn.models._enums import EditMode
 
 
-class UpdateMessageRequest(BaseModel):
+class UpdateMessageRequest(ClientRequest):
     """更新消息请求模型
     
     表示编辑已发送消息的请求。
@@ -25,5 +26,5 @@ class UpdateMessageRequest(BaseModel):
     """
     cmd: Literal["updateMessage"] = "updateMessage"
     customId: str
-    mode: Literal["overwrite", "prepend", "append", "complete"]
+    mode: EditMode
     text: Optional[str] = None
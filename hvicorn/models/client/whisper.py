@@ -3,11 +3,11 @@
 包含 WhisperRequest 模型，用于表示发送私聊消息的请求。
 """
 
-from pydantic import BaseModel
+from hvicorn.models.client.base import ClientRequest
 from typing import Literal
 
 
-class WhisperRequest(BaseModel):
+class WhisperRequest(ClientRequest):
     """私聊消息请求模型
     
     表示向指定用户发送私聊消息的请求。
@@ -1,3 +1,4 @@
+from hvicorn.models.server.base import ServerPackage
 from hvicorn.models.server.chat import ChatPackage
 from hvicorn.models.server.emote import EmotePackage
 from hvicorn.models.server.info import InfoPackage
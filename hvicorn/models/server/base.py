@@ -0,0 +1,21 @@
+"""Base 模块 - 服务器数据包基类
+
+包含 ServerPackage 基类，所有从服务器接收到的数据包模型都继承自它。
+"""
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ServerPackage(BaseModel):
+    """服务器数据包基类
+
+    配置:
+        defer_build: 模型的验证器推迟到第一次使用时再构建，减少导入时间。
+            常见数据包（见 hvicorn.utils.json_to_object.PACKAGE_TYPES）在第一次解析数据包时
+            随联合类型解析器一起构建，其余数据包在第一次收到时构建。
+
+    注意:
+        数据包对象保持可修改，插件可以在处理事件时修改它们。
+    """
+
+    model_config = ConfigDict(defer_build=True)
@@ -4,10 +4,10 @@
 """
 
 from typing import Literal
-from pydantic import BaseModel
+from hvicorn.models.server.base import ServerPackage
 
 
-class CaptchaPackage(BaseModel):
+class CaptchaPackage(ServerPackage):
     """验证码请求包模型
     
     当服务器要求进行验证码验证时，会发送此包。
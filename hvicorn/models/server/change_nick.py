@@ -4,10 +4,10 @@
 """
 
 from typing import Literal
-from pydantic import BaseModel
+from hvicorn.models.server.base import ServerPackage
 
 
-class ChangeNickPackage(BaseModel):
+class ChangeNickPackage(ServerPackage):
     """改名通知包模型
     
     当用户更改昵称时，服务器会广播此包。
@@ -3,11 +3,12 @@
 包含 ChatPackage 模型，表示从服务器接收到的聊天消息。
 """
 
-from pydantic import BaseModel
 from typing import Optional, Literal
+from hvicorn.models.server.base import ServerPackage
+from hvicorn.models._enums import UType
 
 
-class ChatPackage(BaseModel):
+class ChatPackage(ServerPackage):
     """聊天消息包模型
     
     表示从 hack.chat 服务器接收到的公开聊天消息。
@@ -33,6 +34,6 @@ class ChatPackage(BaseModel):
     text: str
     time: int
     trip: Optional[str] = None
-    uType: Literal["user", "mod", "admin"]
+    uType: UType
     userid: int
     customId: Optional[str] = None
@@ -3,11 +3,13 @@
 包含 EmotePackage 模型，表示从服务器接收到的动作消息。
 """
 
-from pydantic import BaseModel
 from typing import Optional, Literal
+from hvicorn.models.server.base import ServerPackage
+from pydantic import computed_field
+from functools import cached_property
 
 
-class EmotePackage(BaseModel):
+class EmotePackage(ServerPackage):
     """动作消息包模型
     
     表示从 hack.chat 服务器接收到的动作消息。
@@ -27,7 +29,12 @@ class EmotePackage(BaseModel):
     cmd: Literal["emote"]
     nick: str
     text: str  # 原始文本
-    content: str  # 实际内容，需要在程序中提取
     time: int
     trip: Optional[str] = None
     userid: int
+
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
+    def content(self) -> str:
+        """实际动作内容：text 中第一个空格之后的部分（去掉昵称），第一次访问时提取"""
+        return self.text.partition(" ")[2]
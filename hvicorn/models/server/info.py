@@ -3,11 +3,11 @@
 包含 InfoPackage 模型，表示从服务器接收到的一般信息消息。
 """
 
-from pydantic import BaseModel
 from typing import Literal
+from hvicorn.models.server.base import ServerPackage
 
 
-class InfoPackage(BaseModel):
+class InfoPackage(ServerPackage):
     """信息消息包模型
     
     表示从 hack.chat 服务器接收到的一般信息消息。
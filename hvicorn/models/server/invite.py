@@ -3,11 +3,12 @@
 包含 InvitePackage 模型，表示收到的频道邀请。
 """
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 from typing import Literal
+from hvicorn.models.server.base import ServerPackage
 
 
-class InvitePackage(BaseModel):
+class InvitePackage(ServerPackage):
     """邀请通知包模型
     
     当有人邀请你加入另一个频道时，会收到此包。
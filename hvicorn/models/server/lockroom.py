@@ -3,11 +3,11 @@
 包含 LockroomPackage 模型，表示被锁定频道拒绝的通知。
 """
 
-from pydantic import BaseModel
 from typing import Literal
+from hvicorn.models.server.base import ServerPackage
 
 
-class LockroomPackage(BaseModel):
+class LockroomPackage(ServerPackage):
     """房间锁定通知包模型
     
     当尝试加入被锁定的频道时，服务器会发送此包并将你移动到其他频道。
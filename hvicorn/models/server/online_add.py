@@ -3,11 +3,12 @@
 包含 OnlineAddPackage 模型，表示有新用户加入频道。
 """
 
-from pydantic import BaseModel
 from typing import Union, Optional, Literal
+from hvicorn.models.server.base import ServerPackage
+from hvicorn.models._enums import UType
 
 
-class OnlineAddPackage(BaseModel):
+class OnlineAddPackage(ServerPackage):
     """用户加入包模型
     
     当有新用户加入频道时，服务器会发送此包。
@@ -35,5 +36,5 @@ class OnlineAddPackage(BaseModel):
     nick: str
     time: int
     trip: Optional[str] = None
-    uType: Literal["user", "mod", "admin"]
+    uType: UType
     userid: int
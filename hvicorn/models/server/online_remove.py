@@ -3,11 +3,11 @@
 包含 OnlineRemovePackage 模型，表示有用户离开频道。
 """
 
-from pydantic import BaseModel
 from typing import Literal
+from hvicorn.models.server.base import ServerPackage
 
 
-class OnlineRemovePackage(BaseModel):
+class OnlineRemovePackage(ServerPackage):
     """用户离开包模型
     
     当有用户离开频道时，服务器会发送此包。
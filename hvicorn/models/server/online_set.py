@@ -5,6 +5,8 @@
 
 from pydantic import BaseModel
 from typing import Optional, Literal, List, Union
+from hvicorn.models.server.base import ServerPackage
+from hvicorn.models._enums import UType
 
 
 class User(BaseModel):
@@ -32,11 +34,11 @@ class User(BaseModel):
     level: int
     nick: str
     trip: Optional[str] = None  # 识别码，仅当用户使用了 tripcode 时存在
-    uType: Literal["user", "mod", "admin"]
+    uType: UType
     userid: int
 
 
-class OnlineSetPackage(BaseModel):
+class OnlineSetPackage(ServerPackage):
     """在线用户列表设置包
     
     当机器人首次加入频道或刷新时，服务器会发送此包，
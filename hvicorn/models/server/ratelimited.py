@@ -3,11 +3,12 @@
 包含 RateLimitedPackage 模型，表示触发速率限制的警告。
 """
 
-from pydantic import BaseModel
 from typing import Literal
+from hvicorn.models.server.base import ServerPackage
+from hvicorn.models._enums import RLType
 
 
-class RateLimitedPackage(BaseModel):
+class RateLimitedPackage(ServerPackage):
     """速率限制包模型
     
     当操作频率过快触发服务器的速率限制时，会收到此包。
@@ -18,6 +19,7 @@ class RateLimitedPackage(BaseModel):
         type: 速率限制类型
             - CHANNEL_RL: 频道加入频率限制
             - COLOR_RL: 颜色更改频率限制
+            - INVITE_RL: 邀请频率限制
             - CHANGENICK_RL: 昵称更改频率限制
             - MESSAGE_RL: 消息发送频率限制
             - GLOBAL_RL: 全局频率限制或被封禁
@@ -30,5 +32,5 @@ class RateLimitedPackage(BaseModel):
         当收到速率限制时，应该减慢对应操作的频率。
     """
     cmd: Literal["warn"]
-    type: Literal["CHANNEL_RL", "COLOR_RL", "CHANGENICK_RL", "MESSAGE_RL", "GLOBAL_RL"]
+    type: RLType
     text: str
@@ -3,14 +3,15 @@
 包含 UncatchedPackage 模型，表示未被框架识别的包。
 """
 
-from pydantic import BaseModel
+from hvicorn.models.server.base import ServerPackage
 
 
-class UncatchedPackage(BaseModel):
+class UncatchedPackage(ServerPackage):
     """未识别包模型
     
     当 json_to_object 无法识别某个包的类型时，
     会返回此模型，包含原始 JSON 数据。
+    它和其他数据包一样是 Pydantic 模型，事件处理器可以调用 model_dump() 等方法。
     
     属性:
         rawjson: 原始 JSON 字典数据
@@ -3,11 +3,12 @@
 包含 UpdateMessagePackage 模型，表示消息被编辑的通知。
 """
 
-from pydantic import BaseModel
 from typing import Literal
+from hvicorn.models.server.base import ServerPackage
+from hvicorn.models._enums import EditMode
 
 
-class UpdateMessagePackage(BaseModel):
+class UpdateMessagePackage(ServerPackage):
     """消息更新包模型
     
     当有人编辑了之前发送的消息时，服务器会广播此包。
@@ -27,7 +28,7 @@ class UpdateMessagePackage(BaseModel):
     cmd: Literal["updateMessage"]
     customId: str
     level: int
-    mode: Literal["overwrite", "prepend", "append", "complete"]
+    mode: EditMode
     text: str
     time: int
     userid: int
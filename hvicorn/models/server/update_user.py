@@ -3,11 +3,12 @@
 包含 UpdateUserPackage 模型，表示用户信息发生变化。
 """
 
-from pydantic import BaseModel
 from typing import Union, Optional, Literal
+from hvicorn.models.server.base import ServerPackage
+from hvicorn.models._enums import UType
 
 
-class UpdateUserPackage(BaseModel):
+class UpdateUserPackage(ServerPackage):
     """用户信息更新包模型
     
     当用户的信息发生变化时（如改名、升级等），服务器会发送此包。
@@ -39,5 +40,5 @@ class UpdateUserPackage(BaseModel):
     nick: Optional[str] = None
     time: Optional[int] = None
     trip: Optional[str] = None
-    uType: Optional[Literal["user", "mod", "admin"]] = None
+    uType: Optional[UType] = None
     userid: Optional[int] = None
@@ -3,11 +3,11 @@
 包含 WarnPackage 模型，表示从服务器接收到的警告消息。
 """
 
-from pydantic import BaseModel
 from typing import Literal
+from hvicorn.models.server.base import ServerPackage
 
 
-class WarnPackage(BaseModel):
+class WarnPackage(ServerPackage):
     """警告消息包模型
     
     表示从 hack.chat 服务器接收到的警告消息。
@@ -3,12 +3,14 @@
 包含 WhisperPackage 模型，表示从服务器接收到的私聊消息。
 """
 
-from pydantic import BaseModel
 from typing import Optional, Literal
 from pydantic.fields import Field
+from hvicorn.models.server.base import ServerPackage
+from pydantic import computed_field
+from functools import cached_property
 
 
-class WhisperPackage(BaseModel):
+class WhisperPackage(ServerPackage):
     """私聊消息包模型
     
     表示接收到的私聊消息（别人发给你的）。
@@ -31,8 +33,13 @@ class WhisperPackage(BaseModel):
         ..., alias="from"
     )  # 使用 from 字段，但映射到 nick （from 是保留关键字）
     text: str  # 原始文本
-    content: str  # 实际内容，需要在程序中提取
     time: int
     userid_to: int
     trip: Optional[str] = None
     type: Literal["whisper"]
+
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
+    def content(self) -> str:
+        """实际私聊内容：text 中第一个 ": " 之后的部分，第一次访问时提取"""
+        return self.text.partition(": ")[2]
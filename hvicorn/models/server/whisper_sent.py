@@ -3,13 +3,15 @@
 包含 WhisperSentPackage 模型，表示私聊消息发送成功的确认。
 """
 
-from pydantic import BaseModel
 from typing import Literal
 
 from pydantic.fields import Field
+from hvicorn.models.server.base import ServerPackage
+from pydantic import computed_field
+from functools import cached_property
 
 
-class WhisperSentPackage(BaseModel):
+class WhisperSentPackage(ServerPackage):
     """私聊发送确认包模型
     
     当你发送私聊消息后，服务器会返回此包作为确认。
@@ -32,7 +34,12 @@ class WhisperSentPackage(BaseModel):
     cmd: Literal["info"]
     userid_from: int = Field(..., alias="from")  # from 是 Python 关键字
     text: str  # 原始文本
-    content: str  # 实际内容，需要在程序中提取
     time: int
     userid_to: int = Field(..., alias="to")  # to 也使用 alias
     type: str = "whisper"
+
+    @computed_field  # type: ignore[prop-decorator]
+    @cached_property
+    def content(self) -> str:
+        """实际私聊内容：text 中第一个 ": " 之后的部分，第一次访问时提取"""
+        return self.text.partition(": ")[2]
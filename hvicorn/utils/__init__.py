@@ -1,2 +1,2 @@
 from hvicorn.utils.generate_customid import generate_customid
-from hvicorn.utils.json_to_object import json_to_object, verifyNick
+from hvicorn.utils.json_to_object import json_to_object, parse_package, verifyNick
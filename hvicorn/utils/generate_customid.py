@@ -5,8 +5,12 @@ CustomId 是一个 6 位随机字符串，由字母和数字组成。
 """
 
 from string import ascii_letters, digits
-from random import choice
+from random import choices
+
+# customId 可使用的字符（字母+数字），只在导入时拼接一次
+CUSTOMID_ALPHABET = ascii_letters + digits
 
 # 生成 6 位随机 customId（字母+数字）
 # 用于标识可编辑消息，确保后续可以通过 customId 更新消息内容
-generate_customid = lambda: "".join([choice(ascii_letters + digits) for _ in range(6)])
+# random.choices 一次调用取出全部 6 个字符
+generate_customid = lambda: "".join(choices(CUSTOMID_ALPHABET, k=6))
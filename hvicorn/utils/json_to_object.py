@@ -28,8 +28,17 @@ from hvicorn.models.server import (
     UncatchedPackage,
     RateLimitedPackage,
 )
-from typing import Union, Dict, Literal
-import string
+from hvicorn.models._enums import RLType
+from typing import Annotated, Any, Callable, Optional, Union, Dict
+from pydantic import Field, TypeAdapter, ValidationError
+import json
+import re
+
+# 合法昵称：最多 24 个字符，仅包含 ASCII 字母、数字和下划线
+NICK_PATTERN = re.compile(r"[A-Za-z0-9_]{0,24}")
+
+# 改名事件的 info 文本："OldNick is now NewNick"，两个昵称都必须合法
+CHANGENICK_PATTERN = re.compile(r"([A-Za-z0-9_]{0,24}) is now ([A-Za-z0-9_]{0,24})")
 
 
 def verifyNick(nick: str) -> bool:
@@ -53,30 +62,23 @@ def verifyNick(nick: str) -> bool:
         >>> verifyNick("a" * 25)  # 超过 24 个字符
         False
     """
-    if len(nick) > 24:
-        return False
-    for char in nick:
-        if char not in string.ascii_letters + string.digits + "_":
-            return False
-    return True
+    return NICK_PATTERN.fullmatch(nick) is not None
 
 
 # 速率限制警告消息到类型的映射
 # 用于将服务器返回的文本警告转换为结构化的类型标识
-RL_MAPPING: Dict[
-    str, Literal["CHANNEL_RL", "COLOR_RL", "CHANGENICK_RL", "MESSAGE_RL", "GLOBAL_RL"]
-] = {
+RL_MAPPING: Dict[str, RLType] = {
     "You are joining channels too fast. Wait a moment and try again.": "CHANNEL_RL",  # 频道加入频率限制
     "You are changing colors too fast. Wait a moment before trying again.": "COLOR_RL",  # 颜色更改频率限制
+    "You are sending invites too fast. Wait a moment before trying again.": "INVITE_RL",  # 邀请频率限制
     "You are changing nicknames too fast. Wait a moment before trying again.": "CHANGENICK_RL",  # 昵称更改频率限制
     "You are sending too much text. Wait a moment and try again.\nPress the up arrow key to restore your last message.": "MESSAGE_RL",  # 消息发送频率限制
     "You are rate-limited or blocked.": "GLOBAL_RL",  # 全局频率限制或被封禁
 }
 
 
-def json_to_object(
-    data: dict,
-) -> Union[
+# json_to_object() 可能返回的所有数据包类型
+Package = Union[
     ChatPackage,
     EmotePackage,
     InfoPackage,
@@ -94,11 +96,91 @@ def json_to_object(
     WhisperSentPackage,
     UncatchedPackage,
     RateLimitedPackage,
-]:
+]
+
+
+def _parse_info(data: dict) -> Package:
+    """处理 info 命令（最复杂，有多种子类型）
+
+    子类型按出现频率依次检查：私聊 → 邀请 → 改名 → 房间锁定 → 普通 info。
+    """
+    info_type = data.get("type")
+    # 处理私聊类型的 info
+    if info_type == "whisper":
+        if data.get("text", "").startswith("You whispered to"):
+            # 自己发出的私聊确认（content 由模型从 text 中提取）
+            return WhisperSentPackage(**data)
+        else:
+            # 接收到的私聊
+            data["userid_to"] = data["to"]  # 重命名字段
+            del data["to"]
+            return WhisperPackage(**data)
+    # 处理邀请类型的 info
+    elif info_type == "invite":
+        # 重命名字段以符合 Pydantic 模型（from_nick 直接通过别名 "from" 读取）
+        data["to_userid"] = data["to"]
+        del data["to"]
+        data["cmd"] = "invite"  # 服务器发送的 cmd 是 "info"
+        return InvitePackage(**data)
+    elif not info_type:
+        # 没有 type 字段：可能是改名或房间锁定
+        # 尝试识别改名事件："OldNick is now NewNick"（一次正则匹配，同时验证两个昵称）
+        text = data.get("text", "")
+        changenick = CHANGENICK_PATTERN.fullmatch(text)
+        if changenick is not None:
+            # 提取旧昵称和新昵称
+            data["old_nick"], data["new_nick"] = changenick.groups()
+            data["cmd"] = "changenick"  # 服务器发送的 cmd 是 "info"
+            return ChangeNickPackage(**data)
+        # 识别房间锁定事件
+        elif (
+            text
+            == "You have been denied access to that channel and have been moved somewhere else. Retry later or wait for a mod to move you."
+        ):
+            return LockroomPackage(cmd="info", time=data["time"])
+        # 普通 info 消息
+        return InfoPackage(**data)
+    # 未识别的 info 类型：返回原始 JSON
+    return UncatchedPackage(rawjson=data)
+
+
+def _parse_warn(data: dict) -> Package:
+    """处理警告消息"""
+    # 检查是否为速率限制警告（一次字典查找）
+    text = data.get("text", "")
+    rl_type = RL_MAPPING.get(text)
+    if rl_type is not None:
+        # 转换为结构化的速率限制包
+        return RateLimitedPackage(cmd="warn", type=rl_type, text=text)
+    # 普通警告消息
+    return WarnPackage(**data)
+
+
+# 只需直接构造模型的命令（按出现频率排列）
+PACKAGE_TYPES: Dict[str, type] = {
+    "chat": ChatPackage,  # 聊天消息
+    "onlineAdd": OnlineAddPackage,  # 新用户加入
+    "onlineRemove": OnlineRemovePackage,  # 用户离开
+    "updateUser": UpdateUserPackage,  # 用户信息更新
+    "updateMessage": UpdateMessagePackage,  # 消息编辑
+    "emote": EmotePackage,  # 动作消息（content 由模型从 text 中提取）
+    "onlineSet": OnlineSetPackage,  # 在线用户列表设置（首次加入频道时）
+    "captcha": CaptchaPackage,  # 验证码请求
+}
+
+# 需要先转换数据再构造模型的命令
+PACKAGE_PARSERS: Dict[str, Callable[[dict], Package]] = {
+    "info": _parse_info,
+    "warn": _parse_warn,
+}
+
+
+def json_to_object(data: dict) -> Package:
     """将 JSON 数据转换为对应的 Pydantic 模型对象
     
     这是 hvicorn 框架的核心解析函数，负责将 hack.chat 服务器返回的
     原始 JSON 数据转换为强类型的 Python 对象。
+    命令通过 PACKAGE_TYPES / PACKAGE_PARSERS 字典查找，不需要逐个比较。
     
     特别处理：
     1. **info 命令的多种形式**：
@@ -107,7 +189,7 @@ def json_to_object(
        - 私聊消息：type="whisper" 分为发出和接收
        - 邀请消息：type="invite"
     2. **速率限制警告**：从 warn 命令中识别特定的限制类型
-    3. **数据转换**：如 emote 需要从 text 中提取 content
+    3. **数据转换**：如私聊需要重命名字段
     
     Args:
         data (dict): 从 WebSocket 接收到的原始 JSON 数据
@@ -122,98 +204,63 @@ def json_to_object(
         - 未识别的命令会返回 UncatchedPackage 对象，包含原始 JSON
         - 此函数会修改传入的 data 字典（添加或删除字段）
     """
-    if not data.get("cmd"):
-        raise ValueError("No `cmd` provided")
-    
     command = data.get("cmd")
-    
-    # 处理聊天消息
-    if command == "chat":
-        return ChatPackage(**data)
-    
-    # 处理动作消息：从 text 中提取 content
-    elif command == "emote":
-        data["content"] = data["text"].split(" ", 1)[1]
-        return EmotePackage(**data)
-    # 处理 info 命令（最复杂，有多种子类型）
-    elif command == "info":
-        if not data.get("type"):
-            # 没有 type 字段：可能是改名或房间锁定
-            # 尝试识别改名事件："OldNick is now NewNick"
-            if (
-                data.get("text", "").count(" ") == 3  # 正好 4 个单词
-                and data.get("text", "").split(" ", 1)[1].startswith("is now")  # 包含 "is now"
-                and verifyNick(data.get("text", "").split()[0])  # 旧昵称合法
-                and verifyNick(data.get("text", "").split()[3])  # 新昵称合法
-            ):
-                # 提取旧昵称和新昵称
-                data["old_nick"] = data.get("text", "").split(" ")[0]
-                data["new_nick"] = data.get("text", "").split(" ")[3]
-                return ChangeNickPackage(**data)
-            # 识别房间锁定事件
-            elif (
-                data.get("text", "")
-                == "You have been denied access to that channel and have been moved somewhere else. Retry later or wait for a mod to move you."
-            ):
-                return LockroomPackage(cmd="info", time=data["time"])
-            # 普通 info 消息
-            return InfoPackage(**data)
-        # 处理私聊类型的 info
-        elif data.get("type") == "whisper":
-            if data.get("text", "").startswith("You whispered to"):
-                # 自己发出的私聊确认
-                data["content"] = data["text"].split(": ", 1)[1]
-                return WhisperSentPackage(**data)
-            else:
-                # 接收到的私聊
-                data["userid_to"] = data["to"]  # 重命名字段
-                del data["to"]
-                data["content"] = data["text"].split(": ", 1)[1]  # 提取实际内容
-                return WhisperPackage(**data)
-        # 处理邀请类型的 info
-        elif data.get("type") == "invite":
-            # 重命名字段以符合 Pydantic 模型
-            data["from_nick"] = data["from"]
-            data["to_userid"] = data["to"]
-            del data["from"]  # 删除原字段
-            del data["to"]
-            return InvitePackage(**data)
-    # 处理在线用户列表设置（首次加入频道时）
-    elif command == "onlineSet":
-        return OnlineSetPackage(**data)
-    # 处理新用户加入
-    elif command == "onlineAdd":
-        return OnlineAddPackage(**data)
-    # 处理用户离开
-    elif command == "onlineRemove":
-        return OnlineRemovePackage(**data)
-    # 处理用户信息更新
-    elif command == "updateUser":
-        return UpdateUserPackage(**data)
-    # 处理消息编辑
-    elif command == "updateMessage":
-        return UpdateMessagePackage(**data)
-    # 处理验证码请求
-    elif command == "captcha":
-        return CaptchaPackage(**data)
-    # 处理警告消息
-    elif command == "warn":
-        # 检查是否为速率限制警告
-        if data.get("text") in [
-            "You are joining channels too fast. Wait a moment and try again.",
-            "You are changing colors too fast. Wait a moment before trying again.",
-            "You are sending invites too fast. Wait a moment before trying again.",
-            "You are changing nicknames too fast. Wait a moment before trying again.",
-            "You are sending too much text. Wait a moment and try again.\nPress the up arrow key to restore your last message.",
-            "You are rate-limited or blocked.",
-        ]:
-            # 转换为结构化的速率限制包
-            return RateLimitedPackage(
-                cmd="warn",
-                type=RL_MAPPING[data.get("text", "")],  # 映射到类型标识
-                text=data.get("text", ""),
-            )
-        # 普通警告消息
-        return WarnPackage(**data)
+    if not command:
+        raise ValueError("No `cmd` provided")
+
+    package_type = PACKAGE_TYPES.get(command)
+    if package_type is not None:
+        return package_type(**data)
+    parser = PACKAGE_PARSERS.get(command)
+    if parser is not None:
+        return parser(data)
     # 未识别的命令：返回原始 JSON
     return UncatchedPackage(rawjson=data)
+
+
+# 以 cmd 为判别字段的 PACKAGE_TYPES 联合类型，可以直接从 JSON 文本解析并验证
+# 构建它会同时构建 PACKAGE_TYPES 中所有模型的验证器，因此推迟到第一次解析数据包时
+_direct_package_adapter: Optional[TypeAdapter] = None
+
+
+def _get_direct_package_adapter() -> TypeAdapter:
+    """获取（第一次调用时构建）PACKAGE_TYPES 联合类型的解析器"""
+    global _direct_package_adapter
+    if _direct_package_adapter is None:
+        _direct_package_adapter = TypeAdapter(
+            Annotated[Union[tuple(PACKAGE_TYPES.values())], Field(discriminator="cmd")]  # type: ignore
+        )
+    return _direct_package_adapter
+
+# 从 JSON 文本中找出 "cmd": "..." 的值（JSON 字符串内的引号都会被转义，不会误匹配字符串内容）
+_CMD_PATTERN = re.compile(r'"cmd"\s*:\s*"([^"\\]*)"')
+
+
+def parse_package(
+    raw: Union[str, bytes], loads: Callable[[Union[str, bytes]], Any] = json.loads
+) -> Package:
+    """将 WebSocket 收到的原始 JSON 文本解析为对应的 Pydantic 模型对象
+
+    PACKAGE_TYPES 中的命令（chat、onlineAdd 等，占绝大多数数据包）由 Pydantic 的 Rust 核心
+    按 cmd 字段直接从 JSON 文本解析并验证为模型，不再先构造中间字典；
+    其他命令（以及验证失败的数据包）交给 loads() 和 json_to_object() 处理。
+    解析前先用正则从文本中找出 cmd，不属于 PACKAGE_TYPES 的命令直接走后一条路径；
+    正则找错（比如匹配到嵌套对象中的 cmd）最多只会多走一次回退，不会影响结果。
+
+    Args:
+        raw (Union[str, bytes]): 原始 JSON 文本
+        loads (Callable, optional): 回退时使用的 JSON 解析函数。默认为 json.loads。
+
+    Returns:
+        Union[...]: 对应类型的 Pydantic 模型对象
+
+    Raises:
+        ValueError: 如果 JSON 数据中没有 `cmd` 字段
+    """
+    match = _CMD_PATTERN.search(raw) if isinstance(raw, str) else None
+    if match is None or match.group(1) in PACKAGE_TYPES:
+        try:
+            return _get_direct_package_adapter().validate_json(raw)
+        except ValidationError:
+            pass
+    return json_to_object(loads(raw))
@@ -1,5 +1,14 @@
+import os
 from setuptools import setup, find_packages  # type: ignore
 
+# 设置环境变量 HVICORN_MYPYC=1 时，用 mypyc 将热点模块编译为 C 扩展（需要安装 mypy 和 C 编译器）
+# 未设置时照常安装纯 Python 包
+ext_modules = []
+if os.environ.get("HVICORN_MYPYC") == "1":
+    from mypyc.build import mypycify  # type: ignore
+
+    ext_modules = mypycify(["hvicorn/bot/client.py"])
+
 setup(
     name="hvicorn",
     version="0.2.0",
@@ -25,4 +34,12 @@ setup(
         "setuptools==70.0.0",
         "websockets==12.0",
     ],
+    ext_modules=ext_modules,  # type: ignore
+    extras_require={
+        "speedups": [
+            "uvloop>=0.18; sys_platform != 'win32'",
+            "orjson>=3.9",
+            "pyahocorasick>=2.0",
+        ],
+    },
 )
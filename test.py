@@ -9,19 +9,65 @@
 - 邀请功能
 """
 
-from hvicorn import Bot, CommandContext, ChatPackage
-from logging import basicConfig, DEBUG
-from asyncio import run, sleep
+from hvicorn import Bot, CommandContext, ChatPackage, Message
+from logging import basicConfig, getLogger, DEBUG
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from asyncio import create_subprocess_exec, get_running_loop, sleep, wait_for
+from asyncio.subprocess import PIPE, STDOUT
+from functools import lru_cache
+from types import CodeType
+import os
 import random
+import sys
 import traceback
 
-# 启用调试日志，查看详细的 WebSocket 交互信息
-basicConfig(level=DEBUG)
+import example_plugin_afk
+import testplugin
+
+# 默认只输出 INFO 及以上的日志；设置 HVICORN_LOGLEVEL=DEBUG 可以查看详细的 WebSocket 交互信息和所有事件
+basicConfig(level=os.environ.get("HVICORN_LOGLEVEL", "INFO").upper())
+# 日志记录只放入队列，由后台线程写出，事件循环不会因输出日志而阻塞
+log_queue: SimpleQueue = SimpleQueue()
+log_listener = QueueListener(log_queue, *getLogger().handlers)
+getLogger().handlers = [QueueHandler(log_queue)]
+log_listener.start()
+# 打印所有事件的日志记录器
+event_logger = getLogger("hvicorn.events")
 
 # 创建 Bot 实例，昵称为 "test_hvicorn"，加入 "test" 频道
 bot = Bot("test_hvicorn", "test")
 owner_trip = "LMeOEB"  # 机器人主人的识别码
 
+# 启动时发送的欢迎消息，介绍可用命令
+BANNER = (
+    "Hello world! I am hvicorn demo bot.\n"
+    "Commands:\n"
+    "\t`.hv editmsg` - demos updatemessage.\n"
+    "\t`.hv invite` - demos inviting.\n"
+    "\t`.hv emote` - demos emote.\n"
+    "\t`.hv threading` - demos multithreading.\n"
+    "\t`.hv plugin` - test plugin.\n"
+    "\t`.hv afk` - a test plugin again, but it can mark you as AfKing.\n"
+    "\t`.hv run` - runs python code in a subprocess (owner only).\n"
+    "Special command: try sending awa"
+)
+
+# .hv editmsg 随机选择的游戏名称
+GAMES = ("Genshin impact", "Honkai impact", "Minecraft", "Project sekai")
+rng = random.Random()
+
+
+@bot.startup
+async def activate_plugins():
+    """启动函数 - 初始化插件
+
+    插件模块已在启动事件循环之前导入，这里只需初始化。
+    启动函数完成前收到的事件会暂存，插件不会错过任何消息。
+    """
+    await bot.activate_plugin(testplugin, command_name=".hv plugin")
+    await bot.activate_plugin(example_plugin_afk, command_prefix=".hv afk")
+
 
 @bot.startup
 async def greetings():
@@ -29,9 +75,7 @@ async def greetings():
     
     发送欢迎消息，介绍可用命令。
     """
-    await bot.send_message(
-        "Hello world! I am hvicorn demo bot.\nCommands:\n\t`.hv editmsg` - demos updatemessage.\n\t`.hv invite` - demos inviting.\n\t`.hv emote` - demos emote.\n\t`.hv threading` - demos multithreading.\n\t`.hv plugin` - test plugin.\n\t`.hv afk` - a test plugin again, but it can mark you as AfKing.\nSpecial command: try sending awa"
-    )
+    await bot.send_message(BANNER)
 
 
 @bot.on(ChatPackage)
@@ -42,36 +86,38 @@ async def on_chat(msg: ChatPackage):
     1. 发送用户信息
     2. 发送私聊消息
     3. 发送动作消息（拥抱）
+
+    三条消息都只是放入发送队列，依次 await 几乎没有开销，
+    会在同一批中按顺序发出，不需要在中间等待。
     """
     if "awa" in msg.text:
+        user = bot.get_user_by_nick(msg.nick)
         # 在频道中公开回复
         await bot.send_message(
-            f"Hey, @{msg.nick}, I see you awa-ing!\nHere's ur info(By hvicorn): {bot.get_user_by_nick(msg.nick)}"
+            f"Hey, @{msg.nick}, I see you awa-ing!\nHere's ur info(By hvicorn): {user}"
         )
-        await sleep(1)  # 等待 1 秒
         # 发送私聊消息
         await bot.whisper(msg.nick, "Here's a *✨secret✨* message for you!")
-        await sleep(1)
         # 发送动作消息
         await bot.emote(f"hugs {msg.nick}")
 
 
+def append_later(msg: Message, text: str) -> None:
+    """定时器回调：在后台把文本追加到消息末尾"""
+    bot.spawn(msg.append(text))
+
+
 @bot.command(".hv editmsg")
 async def editmsg(ctx: CommandContext):
     """演示可编辑消息功能
     
     发送一条消息，5 秒后追加内容。
+    等待由事件循环的定时器完成，命令处理函数发送消息后立即返回，不必挂起 5 秒。
     """
     # 发送可编辑消息
     msg = await ctx.bot.send_message("Do you like playing ", editable=True)
-    await sleep(5)  # 等待 5 秒
-    # 随机选择一个游戏名称
-    choice = (
-        random.choice(["Genshin impact", "Honkai impact", "Minecraft", "Project sekai"])
-        + "?"
-    )
-    # 追加到消息末尾
-    await msg.append(choice)
+    # 随机选择一个游戏名称，5 秒后追加到消息末尾
+    get_running_loop().call_later(5, append_later, msg, rng.choice(GAMES) + "?")
 
 
 @bot.command(".hv invite")
@@ -99,27 +145,62 @@ async def async_command(ctx: CommandContext):
     await ctx.respond("I'm back!")
 
 
+@lru_cache(maxsize=64)
+def compile_exec(source: str) -> CodeType:
+    """编译 .hv exec 的代码，重复执行同一段代码时不必重新编译（最多缓存 64 段）"""
+    return compile(source, "<hv-exec>", "exec")
+
+
 @bot.command(".hv exec")
 async def execute(ctx: CommandContext):
     if ctx.sender.trip != owner_trip:
         return await ctx.respond("I wouldn't do that...")
+    if not ctx.args:
+        return await ctx.respond("Usage: .hv exec <code>")
     try:
-        exec(ctx.text.split(" ", 2)[2], globals())
+        # ctx.args 就是命令前缀之后的代码，不需要再拆分 ctx.text
+        exec(compile_exec(ctx.args), globals())
     except Exception:
         traceback.print_exc()
     return await ctx.respond("Done! check console!")
 
 
-@bot.register_global_function
-async def log(event):
-    print(event)
+@bot.command(".hv run")
+async def run_isolated(ctx: CommandContext):
+    """在独立的 Python 子进程中运行代码，并把输出私聊发给主人
 
+    与 .hv exec 不同，代码不在机器人进程中执行，无法访问机器人的全局变量，
+    但也不会阻塞或干扰机器人的事件循环（最多运行 10 秒）。
+    输出可能包含错误堆栈和环境信息，因此不发送到频道。
+    """
+    if ctx.sender.trip != owner_trip:
+        return await ctx.respond("I wouldn't do that...")
+    process = await create_subprocess_exec(
+        sys.executable, "-c", ctx.args, stdout=PIPE, stderr=STDOUT
+    )
+    try:
+        output, _ = await wait_for(process.communicate(), 10)
+    except TimeoutError:
+        process.kill()
+        await process.wait()
+        return await ctx.bot.whisper(ctx.sender.nick, "Timed out!")
+    await ctx.bot.whisper(ctx.sender.nick, f"```\n{output.decode(errors='replace')[-1000:]}\n```")
 
-async def run_bot():
-    await bot.load_plugin("testplugin", command_name=".hv plugin")
-    await bot.load_plugin("example_plugin_afk", command_prefix=".hv afk")
 
-    await bot.run()
+@bot.register_global_function
+def log(event):
+    """记录所有事件
+
+    同步函数会被直接调用，不必为每个事件创建任务；
+    没有启用 DEBUG 日志时直接返回，不会生成事件的字符串表示。
+    """
+    if event_logger.isEnabledFor(DEBUG):
+        event_logger.debug("%r", event)
 
 
-run(run_bot())
+# bot.start() 在新的事件循环中运行机器人，安装了 uvloop 时使用 uvloop
+try:
+    bot.start()
+finally:
+    # 写出队列中剩余的日志
+    log_listener.stop()
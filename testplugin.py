@@ -10,6 +10,14 @@
 import hvicorn
 
 
+async def hello(ctx: hvicorn.CommandContext):
+    """Hello 命令处理器
+
+    不依赖加载时的参数，定义在模块级别即可，需要 Bot 时可以通过 ctx.bot 获取。
+    """
+    await ctx.respond("Hello from a hvicorn plugin")
+
+
 async def plugin_init(bot: hvicorn.Bot, command_name: str):
     """插件初始化函数
     
@@ -19,9 +27,5 @@ async def plugin_init(bot: hvicorn.Bot, command_name: str):
         bot: hvicorn Bot 实例
         command_name: 要注册的命令名称（由加载插件时传入）
     """
-    async def hello(ctx: hvicorn.CommandContext):
-        """Hello 命令处理器"""
-        await ctx.respond("Hello from a hvicorn plugin")
-
     # 注册命令到 bot
     bot.register_command(command_name, hello)
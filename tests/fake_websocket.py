@@ -0,0 +1,113 @@
+"""测试用的假 WebSocket 连接和数据包构造函数
+
+FakeWebSocket 只实现 Bot 用到的 send / recv / close / open，
+服务器发来的数据包通过 push() 放入，Bot 发出的数据包记录在 sent 中。
+"""
+
+import asyncio
+import json
+from typing import Any, Callable, List, Optional
+
+import websockets
+
+import hvicorn
+
+
+class FakeWebSocket:
+    """假的 WebSocket 客户端连接"""
+
+    def __init__(self) -> None:
+        self.open = True
+        self.sent: List[str] = []  # Bot 发出的 JSON 文本，按发送顺序
+        self.incoming: "asyncio.Queue[Optional[str]]" = asyncio.Queue()  # None 表示连接关闭
+        self.recv_count = 0  # recv() 已经返回的数据包数
+        # 每次 send() 时调用，可以抛出异常模拟发送失败，或根据请求回复数据包
+        self.on_send: Optional[Callable[[dict], Any]] = None
+        # 清除后 send() 会一直等待，模拟发送缓慢的连接
+        self.can_send = asyncio.Event()
+        self.can_send.set()
+
+    def push(self, *packages: dict) -> None:
+        """服务器发送数据包"""
+        for package in packages:
+            self.incoming.put_nowait(json.dumps(package))
+
+    def push_close(self) -> None:
+        """服务器关闭连接"""
+        self.incoming.put_nowait(None)
+
+    async def send(self, text: str) -> None:
+        if not self.open:
+            raise websockets.ConnectionClosed(None, None)
+        await asyncio.sleep(0)  # 和真实连接一样，每次发送都会让出事件循环
+        await self.can_send.wait()
+        if self.on_send is not None:
+            self.on_send(json.loads(text))
+        self.sent.append(text)
+
+    async def recv(self) -> str:
+        package = await self.incoming.get()
+        if package is None:
+            self.open = False
+            raise websockets.ConnectionClosed(None, None)
+        self.recv_count += 1
+        return package
+
+    async def close(self) -> None:
+        if self.open:
+            self.open = False
+            self.push_close()
+
+    def sent_packages(self) -> List[dict]:
+        """Bot 发出的数据包（已解析）"""
+        return [json.loads(text) for text in self.sent]
+
+
+def connect_fake(bot: hvicorn.Bot, websocket: FakeWebSocket) -> None:
+    """让 bot.run() 使用假连接，而不是连接服务器"""
+
+    async def _connect() -> None:
+        bot.websocket = websocket  # type: ignore[assignment]
+
+    bot._connect = _connect  # type: ignore[method-assign]
+
+
+def user(nick: str, userid: int) -> dict:
+    """onlineSet 中的用户信息"""
+    return {
+        "channel": "test",
+        "color": False,
+        "hash": "h",
+        "isBot": False,
+        "isme": False,
+        "level": 1,
+        "nick": nick,
+        "trip": None,
+        "uType": "user",
+        "userid": userid,
+    }
+
+
+def online_set(*nicks: str) -> dict:
+    """onlineSet 数据包"""
+    return {
+        "cmd": "onlineSet",
+        "channel": "test",
+        "time": 0,
+        "nicks": list(nicks),
+        "users": [user(nick, userid) for userid, nick in enumerate(nicks, 1)],
+    }
+
+
+def chat(nick: str, text: str) -> dict:
+    """chat 数据包"""
+    return {
+        "cmd": "chat",
+        "channel": "test",
+        "level": 1,
+        "nick": nick,
+        "text": text,
+        "time": 0,
+        "uType": "user",
+        "userid": 1,
+    }
@@ -0,0 +1,110 @@
+"""Bot.run() 的加入频道和启动流程测试
+
+运行方式（在仓库根目录）:
+    python -m unittest discover -s tests
+"""
+
+import asyncio
+import unittest
+from typing import List
+from unittest import mock
+
+import hvicorn
+import hvicorn.bot.client
+from fake_websocket import FakeWebSocket, chat, connect_fake, online_set
+
+
+class StartupTest(unittest.IsolatedAsyncioTestCase):
+    """启动函数与事件处理器的先后顺序"""
+
+    async def test_handlers_wait_for_startup(self) -> None:
+        bot = hvicorn.Bot("bot", "test")
+        websocket = FakeWebSocket()
+        connect_fake(bot, websocket)
+
+        def on_send(package: dict) -> None:
+            if package["cmd"] == "join":
+                websocket.push(online_set("alice", "bot"), chat("alice", "/ping"))
+
+        websocket.on_send = on_send
+        seen_users: List[str] = []
+
+        @bot.startup
+        async def greet():
+            # 启动函数挂起期间，/ping 已经到达，但还不能被处理
+            await asyncio.sleep(0.05)
+            seen_users.extend(user.nick for user in bot.users)
+            await bot.send_message("hello")
+
+        @bot.command("/ping")
+        async def ping(ctx: hvicorn.CommandContext):
+            await ctx.respond("pong", at_sender=False)
+            bot.kill()
+
+        await asyncio.wait_for(bot.run(), 5)
+        self.assertEqual(
+            [(package["cmd"], package.get("text")) for package in websocket.sent_packages()],
+            [("join", None), ("chat", "hello"), ("chat", "pong")],
+        )
+        # onlineSet 在启动函数运行前就已更新在线用户列表
+        self.assertEqual(seen_users, ["alice", "bot"])
+
+
+class JoinTest(unittest.IsolatedAsyncioTestCase):
+    """join() 等待 onlineSet 的三种结果，接收循环由假任务代替"""
+
+    async def asyncSetUp(self) -> None:
+        self.bot = hvicorn.Bot("bot", "test")
+        self.websocket = FakeWebSocket()
+        self.bot.websocket = self.websocket  # type: ignore[assignment]
+
+    def start_receiver(self, coro) -> asyncio.Task:
+        """启动假的接收循环，join() 会同时等待它"""
+        receiver = asyncio.get_running_loop().create_task(coro)
+        self.addCleanup(receiver.cancel)
+        self.bot._receiver = receiver
+        return receiver
+
+    async def test_online_set(self) -> None:
+        async def receive():
+            await asyncio.sleep(0.01)
+            await self.bot._on_online_set(
+                hvicorn.OnlineSetPackage.model_validate(online_set("alice", "bot"))
+            )
+            await asyncio.sleep(60)  # 加入后接收循环继续运行
+
+        self.start_receiver(receive())
+        with self.assertNoLogs(level="WARNING"):
+            await asyncio.wait_for(self.bot.join(), 1)
+        self.assertEqual(self.websocket.sent_packages()[0]["cmd"], "join")
+        self.assertEqual([user.nick for user in self.bot.users], ["alice", "bot"])
+
+    async def test_receiver_error(self) -> None:
+        async def receive():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("Websocket connection error")
+
+        self.start_receiver(receive())
+        # 不必等满 JOIN_TIMEOUT，接收循环的异常从 join() 抛出
+        with self.assertRaisesRegex(RuntimeError, "Websocket connection error"):
+            await asyncio.wait_for(self.bot.join(), 1)
+
+    async def test_receiver_closed(self) -> None:
+        async def receive():
+            await asyncio.sleep(0.01)
+
+        self.start_receiver(receive())
+        with self.assertLogs(level="WARNING") as logs:
+            await asyncio.wait_for(self.bot.join(), 1)
+        self.assertIn("Connection closed before onlineSet", logs.output[0])
+
+    async def test_timeout(self) -> None:
+        self.start_receiver(asyncio.sleep(60))
+        with mock.patch.object(hvicorn.bot.client, "JOIN_TIMEOUT", 0.05):
+            with self.assertLogs(level="WARNING") as logs:
+                await asyncio.wait_for(self.bot.join(), 1)
+        self.assertIn("No onlineSet received", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
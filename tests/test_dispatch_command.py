@@ -0,0 +1,116 @@
+"""命令分发（_dispatch_command）和插件卸载的测试
+
+运行方式（在仓库根目录）:
+    python -m unittest discover -s tests
+"""
+
+import asyncio
+import json
+import unittest
+from typing import List, Tuple
+
+import hvicorn
+from fake_websocket import chat, user
+
+
+class DispatchCommandTest(unittest.IsolatedAsyncioTestCase):
+    """消息的第一个词查找命令，包含空格的前缀按第一个词分组"""
+
+    async def asyncSetUp(self) -> None:
+        self.bot = hvicorn.Bot("bot", "test")
+        self.calls: List[Tuple[str, str]] = []  # (命令前缀, 参数)
+        online_add = {k: v for k, v in user("alice", 1).items() if k != "isme"}
+        await self.feed_raw(json.dumps({"cmd": "onlineAdd", "time": 0, **online_add}))
+
+    def command(self, prefix: str) -> None:
+        """注册一个记录调用的命令"""
+
+        async def handler(ctx: hvicorn.CommandContext):
+            self.calls.append((prefix, ctx.args))
+
+        self.bot.register_command(prefix, handler)
+
+    async def feed_raw(self, package: str) -> None:
+        await self.bot._handle_package(package, ignore_self=True)
+        while self.bot._live_tasks:
+            await asyncio.gather(*self.bot._live_tasks)
+
+    async def dispatch(self, text: str) -> List[Tuple[str, str]]:
+        """发送一条聊天消息，返回被触发的命令"""
+        self.calls.clear()
+        await self.feed_raw(json.dumps(chat("alice", text)))
+        return sorted(self.calls)
+
+    async def test_prefixes(self) -> None:
+        for prefix in ("/ping", ".hv", ".hv sub", ".hv sub2"):
+            self.command(prefix)
+        self.assertEqual(await self.dispatch("/ping"), [("/ping", "")])
+        self.assertEqual(await self.dispatch("/ping a b"), [("/ping", "a b")])
+        # 前缀之后必须是空格或消息结束
+        self.assertEqual(await self.dispatch("/pingx"), [])
+        self.assertEqual(await self.dispatch("hello /ping"), [])
+        self.assertEqual(await self.dispatch(".hv"), [(".hv", "")])
+        # 单词前缀和包含空格的前缀同时匹配时都会触发
+        self.assertEqual(await self.dispatch(".hv sub"), [(".hv", "sub"), (".hv sub", "")])
+        self.assertEqual(
+            await self.dispatch(".hv sub a b"), [(".hv", "sub a b"), (".hv sub", "a b")]
+        )
+        self.assertEqual(await self.dispatch(".hv subx"), [(".hv", "subx")])
+        self.assertEqual(await self.dispatch(".hv sub2 x"), [(".hv", "sub2 x"), (".hv sub2", "x")])
+
+    async def test_unload_cleans_prefix_groups(self) -> None:
+        self.command(".hv")
+        self.command(".hv keep")
+
+        def plugin_init(bot: hvicorn.Bot) -> None:
+            self.command(".hv sub")
+            self.command(".tool run")
+
+        await self.bot.load_plugin("dispatch_test_plugin", plugin_init)
+        self.assertEqual(
+            await self.dispatch(".hv sub a"), [(".hv", "sub a"), (".hv sub", "a")]
+        )
+        self.assertEqual(await self.dispatch(".tool run"), [(".tool run", "")])
+
+        self.bot.unload_plugin("dispatch_test_plugin")
+        self.assertEqual(await self.dispatch(".hv sub a"), [(".hv", "sub a")])
+        self.assertEqual(await self.dispatch(".tool run"), [])
+        # 插件独占的分组被删除，其他前缀仍在原分组中
+        self.assertEqual(self.bot._multi_word_prefixes, {".hv": [".hv keep"]})
+        self.assertEqual(await self.dispatch(".hv keep"), [(".hv", "keep"), (".hv keep", "")])
+
+
+class UnloadQueuedHandlerTest(unittest.IsolatedAsyncioTestCase):
+    """启用 queued_handlers 时，卸载插件会停止其处理器的消费任务"""
+
+    async def test_unload_stops_worker(self) -> None:
+        bot = hvicorn.Bot("bot", "test")
+        bot.optional_features.queued_handlers = True
+        gate = asyncio.Event()
+        texts: List[str] = []
+
+        async def on_chat(event: hvicorn.ChatPackage):
+            await gate.wait()
+            texts.append(event.text)
+
+        def plugin_init(bot: hvicorn.Bot) -> None:
+            bot.register_event_function(hvicorn.ChatPackage, on_chat)
+
+        await bot.load_plugin("queued_test_plugin", plugin_init)
+        for text in ("a", "b", "c"):
+            await bot._handle_package(json.dumps(chat("alice", text)), ignore_self=True)
+        await asyncio.sleep(0)
+        worker = bot._handler_workers[on_chat]
+
+        bot.unload_plugin("queued_test_plugin")
+        self.assertNotIn(on_chat, bot._handler_workers)
+        self.assertNotIn(on_chat, bot._handler_queues)
+        gate.set()
+        await asyncio.sleep(0.01)
+        self.assertTrue(worker.cancelled())
+        # 已排队的事件不会再交给已卸载插件的处理器
+        self.assertEqual(texts, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""示例 AFK 插件的测试
+
+运行方式（在仓库根目录）:
+    python -m unittest discover -s tests
+"""
+
+import asyncio
+import json
+import unittest
+from typing import List
+from unittest import mock
+
+import hvicorn
+import example_plugin_afk
+
+
+def user_package(cmd: str, nick: str, userid: int) -> str:
+    """构造 onlineAdd 数据包"""
+    return json.dumps(
+        {
+            "cmd": cmd,
+            "channel": "test",
+            "color": False,
+            "hash": "h",
+            "isBot": False,
+            "level": 1,
+            "nick": nick,
+            "trip": None,
+            "uType": "user",
+            "userid": userid,
+            "time": 0,
+        }
+    )
+
+
+def chat_package(nick: str, text: str) -> str:
+    """构造 chat 数据包"""
+    return json.dumps(
+        {
+            "cmd": "chat",
+            "channel": "test",
+            "level": 1,
+            "nick": nick,
+            "text": text,
+            "time": 0,
+            "uType": "user",
+            "userid": 1,
+        }
+    )
+
+
+class AfkPluginTest(unittest.IsolatedAsyncioTestCase):
+    """通过 Bot 的数据包分发驱动插件，记录插件发出的消息"""
+
+    async def asyncSetUp(self) -> None:
+        self.bot = hvicorn.Bot("afkbot", "test")
+        self.sent: List[str] = []
+
+        async def send_message(text, editable=False):
+            self.sent.append(text)
+
+        self.bot.send_message = send_message  # type: ignore[method-assign]
+        self.clock = 1000.0
+        patcher = mock.patch.object(example_plugin_afk, "monotonic", lambda: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for userid, nick in enumerate(("alice", "bob"), 1):
+            await self.feed(user_package("onlineAdd", nick, userid))
+
+    async def feed(self, package: str) -> None:
+        """分发一个数据包，并等待插件在后台发送的回复"""
+        await self.bot._handle_package(package, ignore_self=True)
+        while self.bot._live_tasks:
+            await asyncio.gather(*self.bot._live_tasks)
+
+    async def test_welcome_back(self) -> None:
+        await self.bot.load_plugin("example_plugin_afk")
+        await self.feed(chat_package("alice", "/afk sleeping"))
+        self.sent.clear()
+        await self.feed(chat_package("alice", "I'm back"))
+        self.assertEqual(self.sent, ["@alice Welcome back."])
+
+    async def test_no_welcome_after_ttl(self) -> None:
+        await self.bot.load_plugin("example_plugin_afk", afk_ttl=60)
+        await self.feed(chat_package("alice", "/afk sleeping"))
+        self.sent.clear()
+        self.clock += 61
+        await self.feed(chat_package("alice", "I'm back"))
+        self.assertEqual(self.sent, [])
+
+    async def check_longest_mention(self) -> None:
+        """AFK 用户 ab 和 abc 同时存在时，@abc 应提示 abc"""
+        await self.bot.load_plugin("example_plugin_afk")
+        for userid, nick in enumerate(("ab", "abc"), 3):
+            await self.feed(user_package("onlineAdd", nick, userid))
+            await self.feed(chat_package(nick, "/afk"))
+        self.sent.clear()
+        await self.feed(chat_package("bob", "hi @abc"))
+        self.assertEqual(self.sent, ["@bob abc is now AfK."])
+
+    async def test_longest_mention_regex(self) -> None:
+        await self.check_longest_mention()
+
+    async def test_longest_mention_trie(self) -> None:
+        with mock.patch.multiple(example_plugin_afk, INDEX_THRESHOLD=0, ahocorasick=None):
+            await self.check_longest_mention()
+
+    @unittest.skipIf(example_plugin_afk.ahocorasick is None, "pyahocorasick is not installed")
+    async def test_longest_mention_automaton(self) -> None:
+        with mock.patch.object(example_plugin_afk, "INDEX_THRESHOLD", 0):
+            await self.check_longest_mention()
+
+
+if __name__ == "__main__":
+    unittest.main()
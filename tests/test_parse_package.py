@@ -0,0 +1,92 @@
+"""parse_package() 的测试
+
+parse_package() 先用正则找出 cmd，常见命令直接从 JSON 文本验证为模型，
+其余的回退到 json_to_object()。这里检查每种数据包的解析结果，
+并且与直接调用 json_to_object() 的结果一致。
+
+运行方式（在仓库根目录）:
+    python -m unittest discover -s tests
+"""
+
+import json
+import unittest
+from typing import Any
+
+import hvicorn
+from hvicorn.utils.json_to_object import json_to_object, parse_package
+
+CHAT = {"cmd": "chat", "nick": "a", "text": "hi", "channel": "c", "level": 1, "time": 1, "uType": "user", "userid": 1, "color": "ff0000", "trip": "x", "hash": "h", "isBot": False}
+
+# (说明, 数据包, 期望的类型)
+FRAMES = [
+    ("chat", CHAT, hvicorn.ChatPackage),
+    ("emote", {"cmd": "emote", "nick": "a", "text": "@a waves", "channel": "c", "time": 1, "userid": 1, "trip": "x"}, hvicorn.EmotePackage),
+    ("onlineAdd", {"cmd": "onlineAdd", "nick": "bob", "channel": "c", "color": False, "hash": "h", "isBot": False, "level": 1, "time": 1, "trip": None, "uType": "user", "userid": 3}, hvicorn.OnlineAddPackage),
+    ("onlineRemove", {"cmd": "onlineRemove", "nick": "bob", "channel": "c", "time": 1, "userid": 3}, hvicorn.OnlineRemovePackage),
+    ("onlineSet", {"cmd": "onlineSet", "channel": "c", "time": 1, "nicks": ["bob"], "users": [{"channel": "c", "color": False, "hash": "h", "isBot": False, "isme": True, "level": 1, "nick": "bob", "trip": None, "uType": "user", "userid": 3}]}, hvicorn.OnlineSetPackage),
+    ("updateUser", {"cmd": "updateUser", "channel": "test", "color": "ff0000", "nick": "bob", "level": 5}, hvicorn.UpdateUserPackage),
+    ("updateMessage", {"cmd": "updateMessage", "customId": "abc", "mode": "append", "text": "!", "userid": 1, "channel": "c", "time": 1, "level": 1}, hvicorn.UpdateMessagePackage),
+    ("captcha", {"cmd": "captcha", "text": "xx", "channel": "c", "time": 1}, hvicorn.CaptchaPackage),
+    ("info", {"cmd": "info", "text": "plain info", "channel": "c", "time": 1}, hvicorn.InfoPackage),
+    ("info: not a nick change", {"cmd": "info", "text": "al ce is now", "channel": "c", "time": 1}, hvicorn.InfoPackage),
+    ("info: nick change", {"cmd": "info", "text": "alice is now bob", "channel": "c", "time": 1}, hvicorn.ChangeNickPackage),
+    ("info: lockroom", {"cmd": "info", "text": "You have been denied access to that channel and have been moved somewhere else. Retry later or wait for a mod to move you.", "channel": "c", "time": 1}, hvicorn.LockroomPackage),
+    ("info: whisper sent", {"cmd": "info", "type": "whisper", "text": "You whispered to @bob: hello: there", "channel": "c", "time": 1, "from": 1, "to": 3}, hvicorn.WhisperSentPackage),
+    ("info: whisper", {"cmd": "info", "type": "whisper", "from": "bob", "to": 5, "text": "bob whispered: hi: x", "channel": "c", "time": 1, "level": 1, "uType": "user", "trip": None, "nick": "bob", "userid": 3}, hvicorn.WhisperPackage),
+    ("info: invite", {"cmd": "info", "type": "invite", "from": "bob", "to": 5, "inviteChannel": "x", "text": "bob invited you to ?x", "channel": "c", "time": 1}, hvicorn.InvitePackage),
+    ("info: unknown type", {"cmd": "info", "type": "weird", "text": "?", "time": 1}, hvicorn.UncatchedPackage),
+    ("warn: rate limit", {"cmd": "warn", "text": "You are changing colors too fast. Wait a moment before trying again.", "channel": "c", "time": 1}, hvicorn.RateLimitedPackage),
+    ("warn: invite rate limit", {"cmd": "warn", "text": "You are sending invites too fast. Wait a moment before trying again.", "channel": "c", "time": 1}, hvicorn.RateLimitedPackage),
+    ("warn", {"cmd": "warn", "text": "something else", "channel": "c", "time": 1}, hvicorn.WarnPackage),
+    ("unknown cmd", {"cmd": "nope", "x": 1}, hvicorn.UncatchedPackage),
+    ("cmd not first", {**{k: v for k, v in CHAT.items() if k != "cmd"}, "cmd": "chat"}, hvicorn.ChatPackage),
+]
+
+
+class ParsePackageTest(unittest.TestCase):
+    def test_frames(self) -> None:
+        for name, data, expected in FRAMES:
+            raw = json.dumps(data)
+            with self.subTest(name):
+                package = parse_package(raw)
+                self.assertIs(type(package), expected)
+                # 与旧的解析方式（json.loads + json_to_object）结果相同
+                self.assertEqual(package, json_to_object(json.loads(raw)))
+                # bytes 数据包不经过正则，结果也相同
+                self.assertEqual(parse_package(raw.encode()), package)
+
+    def test_fields(self) -> None:
+        def parse(data: dict) -> Any:
+            return parse_package(json.dumps(data))
+
+        frames = {name: data for name, data, _ in FRAMES}
+        nick_change = parse(frames["info: nick change"])
+        self.assertEqual((nick_change.old_nick, nick_change.new_nick), ("alice", "bob"))
+        invite = parse(frames["info: invite"])
+        self.assertEqual((invite.from_nick, invite.to_userid, invite.invite_channel), ("bob", 5, "x"))
+        self.assertEqual(parse(frames["info: whisper"]).content, "hi: x")
+        self.assertEqual(parse(frames["info: whisper sent"]).content, "hello: there")
+        self.assertEqual(parse(frames["emote"]).content, "waves")
+        self.assertEqual(parse({**frames["emote"], "text": "@a"}).content, "")
+        self.assertEqual(parse(frames["warn: invite rate limit"]).type, "INVITE_RL")
+        unknown = parse(frames["unknown cmd"])
+        self.assertEqual(unknown.rawjson, {"cmd": "nope", "x": 1})
+        # 未识别的数据包也是 Pydantic 模型
+        self.assertEqual(unknown.model_dump(), {"rawjson": {"cmd": "nope", "x": 1}})
+
+    def test_invalid(self) -> None:
+        cases = [
+            ("malformed JSON", '{"cmd": "chat", "text": '),
+            ("malformed JSON, unknown cmd", '{"cmd": "nope", '),
+            ("no cmd", json.dumps({"x": 1})),
+            ("missing field", json.dumps({k: v for k, v in CHAT.items() if k != "text"})),
+        ]
+        for name, raw in cases:
+            with self.subTest(name):
+                # json.JSONDecodeError、pydantic.ValidationError 都是 ValueError
+                with self.assertRaises(ValueError):
+                    parse_package(raw)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""接收循环（_read_loop / _receive_loop）的测试
+
+运行方式（在仓库根目录）:
+    python -m unittest discover -s tests
+"""
+
+import asyncio
+import unittest
+from typing import List
+
+import hvicorn
+from hvicorn.bot.client import INBOX_SIZE
+from fake_websocket import FakeWebSocket, chat
+
+
+class ReceiveLoopTest(unittest.IsolatedAsyncioTestCase):
+    """读取任务、接收缓冲区和事件分发"""
+
+    async def asyncSetUp(self) -> None:
+        self.bot = hvicorn.Bot("bot", "test")
+        self.websocket = FakeWebSocket()
+        self.bot.websocket = self.websocket  # type: ignore[assignment]
+        self.texts: List[str] = []
+        self.events: List[str] = []
+
+        @self.bot.on(hvicorn.ChatPackage)
+        def on_chat(event: hvicorn.ChatPackage):
+            self.texts.append(event.text)
+            self.events.append("chat")
+
+        @self.bot.on("disconnect")
+        def on_disconnect():
+            self.events.append("disconnect")
+
+    def start(self) -> asyncio.Task:
+        receiver = asyncio.get_running_loop().create_task(self.bot._receive_loop(True))
+        self.addCleanup(receiver.cancel)
+        return receiver
+
+    async def test_close_fires_disconnect_after_events(self) -> None:
+        self.websocket.push(chat("alice", "a"), chat("alice", "b"))
+        self.websocket.push_close()
+        await asyncio.wait_for(self.start(), 1)
+        self.assertEqual(self.texts, ["a", "b"])
+        self.assertEqual(self.events, ["chat", "chat", "disconnect"])
+        self.assertTrue(self.bot.killed)
+
+    async def test_reading_pauses_when_inbox_full(self) -> None:
+        count = INBOX_SIZE + 50
+        self.websocket.push(*(chat("alice", str(i)) for i in range(count)))
+        gate = asyncio.Event()
+        handle_package = self.bot._handle_package
+
+        async def slow_handle_package(package, ignore_self: bool) -> None:
+            await gate.wait()  # 事件处理跟不上
+            await handle_package(package, ignore_self)
+
+        self.bot._handle_package = slow_handle_package  # type: ignore[method-assign]
+        receiver = self.start()
+        await asyncio.sleep(0.01)
+        # 正在处理第一个数据包，缓冲区存满 INBOX_SIZE 个后暂停读取
+        self.assertEqual(self.websocket.recv_count, INBOX_SIZE + 1)
+        self.assertEqual(len(self.bot._inbox), INBOX_SIZE)
+        gate.set()
+        self.websocket.push_close()
+        await asyncio.wait_for(receiver, 1)
+        self.assertEqual(self.texts, [str(i) for i in range(count)])
+        self.assertEqual(self.events[-1], "disconnect")
+
+    async def test_connection_error_is_raised(self) -> None:
+        async def recv() -> str:
+            raise OSError("connection reset")
+
+        self.websocket.recv = recv  # type: ignore[method-assign]
+        with self.assertRaisesRegex(RuntimeError, "Websocket connection error"):
+            await asyncio.wait_for(self.start(), 1)
+        self.assertNotIn("disconnect", self.events)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""发送队列（_send_text / _writer_loop）和 run() 退出顺序的测试
+
+运行方式（在仓库根目录）:
+    python -m unittest discover -s tests
+"""
+
+import asyncio
+import unittest
+from typing import List
+
+import hvicorn
+from hvicorn.bot.client import OUTBOUND_SIZE, SEND_BATCH_SIZE
+from fake_websocket import FakeWebSocket, connect_fake
+
+
+class SendQueueTest(unittest.IsolatedAsyncioTestCase):
+    """发送队列的顺序、背压和发送失败"""
+
+    async def asyncSetUp(self) -> None:
+        self.bot = hvicorn.Bot("bot", "test")
+        self.websocket = FakeWebSocket()
+        self.bot.websocket = self.websocket  # type: ignore[assignment]
+        self.bot._writer_task = self.bot.spawn(self.bot._writer_loop())
+        self.addCleanup(self.bot._stop_writer)
+        self.queued = 0  # send_message 已经返回的次数
+
+    async def send_many(self, count: int) -> None:
+        for i in range(count):
+            await self.bot.send_message(f"m{i}")
+            self.queued += 1
+
+    async def test_order_and_backpressure(self) -> None:
+        count = OUTBOUND_SIZE + 100
+        self.websocket.can_send.clear()
+        sender = asyncio.get_running_loop().create_task(self.send_many(count))
+        await asyncio.sleep(0.01)
+        # 连接发送不动时，队列满后调用方等待，而不是无限堆积：
+        # 发送任务取走了一批（SEND_BATCH_SIZE 个），队列中还有 OUTBOUND_SIZE 个
+        self.assertFalse(sender.done())
+        self.assertEqual(self.bot._outbound.qsize(), OUTBOUND_SIZE)
+        self.assertEqual(self.queued, OUTBOUND_SIZE + SEND_BATCH_SIZE)
+        self.websocket.can_send.set()
+        await asyncio.wait_for(sender, 1)
+        await self.bot._flush_outbound()
+        texts = [package["text"] for package in self.websocket.sent_packages()]
+        self.assertEqual(texts, [f"m{i}" for i in range(count)])
+
+    async def test_failed_send_raises(self) -> None:
+        def on_send(package: dict) -> None:
+            if package["text"] == "m1":
+                raise OSError("broken pipe")
+
+        self.websocket.on_send = on_send
+        with self.assertLogs(level="WARNING") as logs:
+            await self.send_many(3)
+            await self.bot._flush_outbound()
+        self.assertIn("stopping the send queue", logs.output[0])
+        self.assertTrue(self.bot._writer_task is not None and self.bot._writer_task.done())
+        # 之后的发送不再静默丢弃，而是抛出 ConnectionError
+        with self.assertRaises(ConnectionError) as raised:
+            await self.bot.send_message("late")
+        self.assertIsInstance(raised.exception.__cause__, OSError)
+        self.assertEqual([package["text"] for package in self.websocket.sent_packages()], ["m0"])
+
+    async def test_kill_flushes_queue(self) -> None:
+        self.websocket.can_send.clear()
+        await self.send_many(10)
+        self.bot.kill()
+        await asyncio.sleep(0.01)
+        self.assertTrue(self.websocket.open)  # 排队的数据包发送完之前不会关闭连接
+        self.websocket.can_send.set()
+        for _ in range(100):
+            if not self.websocket.open:
+                break
+            await asyncio.sleep(0.01)
+        self.assertFalse(self.websocket.open)
+        self.assertEqual(len(self.websocket.sent), 10)
+
+
+class ShutdownTest(unittest.IsolatedAsyncioTestCase):
+    """run() 退出时先等待事件处理器，再发送完队列，最后停止发送队列"""
+
+    async def asyncSetUp(self) -> None:
+        self.bot = hvicorn.Bot("bot", "test")
+        self.websocket = FakeWebSocket()
+        connect_fake(self.bot, self.websocket)
+
+    async def test_normal_exit_sends_queued_packets(self) -> None:
+        async def handler():
+            for i in range(40):
+                await self.bot.send_message(f"m{i}")
+            await asyncio.sleep(0.01)
+            await self.bot.send_message("last")  # 接收循环结束后才发送
+
+        async def receive_loop(ignore_self: bool) -> None:
+            self.bot._joined.set()
+            # 连接发送缓慢：接收循环结束时，事件处理器的消息还在队列中
+            self.websocket.can_send.clear()
+            asyncio.get_running_loop().call_later(0.05, self.websocket.can_send.set)
+            self.bot.spawn(handler())
+            await asyncio.sleep(0)
+
+        self.bot._receive_loop = receive_loop  # type: ignore[method-assign]
+        await asyncio.wait_for(self.bot.run(), 1)
+        texts = [package.get("text") for package in self.websocket.sent_packages()]
+        self.assertEqual(texts, [None] + [f"m{i}" for i in range(40)] + ["last"])  # join 没有 text
+        self.assertIsNone(self.bot._writer_task)
+
+    async def test_cancelled_exit_cancels_handlers(self) -> None:
+        handler_started = asyncio.Event()
+        handler_tasks: List[asyncio.Task] = []
+
+        async def handler():
+            handler_started.set()
+            await asyncio.sleep(60)
+
+        async def receive_loop(ignore_self: bool) -> None:
+            self.bot._joined.set()
+            handler_tasks.append(self.bot.spawn(handler()))
+            await asyncio.sleep(60)
+
+        self.bot._receive_loop = receive_loop  # type: ignore[method-assign]
+        run = asyncio.get_running_loop().create_task(self.bot.run())
+        await asyncio.wait_for(handler_started.wait(), 1)
+        run.cancel()
+        await asyncio.wait_for(run, 1)
+        self.assertTrue(handler_tasks[0].cancelled())
+        self.assertEqual(self.bot._live_tasks, set())
+        self.assertIsNone(self.bot._writer_task)
+        self.assertTrue(self.bot._outbound.empty())
+
+
+if __name__ == "__main__":
+    unittest.main()